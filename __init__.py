@@ -46,18 +46,6 @@ modules = [
 ]
 
 
-def auto_detect_freecad_delayed():
-    """Auto-detect FreeCAD after registration is complete"""
-    try:
-        prefs = bpy.context.preferences.addons[__package__].preferences
-        if prefs.auto_detect_freecad and not prefs.freecad_path:
-            print("ApexCad: Auto-detecting FreeCAD installation...")
-            bpy.ops.apexcad.detect_freecad()
-    except Exception as e:
-        print(f"ApexCad: Auto-detect skipped - {e}")
-    return None
-
-
 def register():
     """Register all addon modules and classes"""
     # Register each module
@@ -68,9 +56,6 @@ def register():
     # Register file import menu
     bpy.types.TOPBAR_MT_file_import.append(ui.menu_func_import)
     
-    # Auto-detect FreeCAD after a short delay (ensures preferences are ready)
-    bpy.app.timers.register(auto_detect_freecad_delayed, first_interval=0.1)
-    
     print("ApexCadImporter: Successfully registered")
 
 
@@ -79,6 +64,9 @@ def unregister():
     # Unregister file import menu
     bpy.types.TOPBAR_MT_file_import.remove(ui.menu_func_import)
     
+    # Stop the shared FreeCAD worker process
+    freecad_bridge.shutdown()
+    
     # Unregister each module in reverse order
     for module in reversed(modules):
         if hasattr(module, 'unregister'):
@@ -9,11 +9,301 @@ import subprocess
 import os
 import tempfile
 import json
+import heapq
+import shutil
+import struct
 import threading
 import queue
 import time
+from concurrent.futures import ThreadPoolExecutor, wait as _wait_futures
+from collections import deque
 from pathlib import Path
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # orjson is optional; stdlib json accepts the same bytes input
+    _json_loads = json.loads
+
+try:
+    import msgpack
+except ImportError:
+    # msgpack is optional; the worker then sends JSON records
+    msgpack = None
+
+
+# Static script run by the persistent FreeCAD worker process
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "freecad_worker.py")
+
+# Read size used when draining FreeCAD's output pipe
+_READ_CHUNK = 64 * 1024
+
+# Prefix of protocol lines written by the worker (see freecad_worker.py)
+_PROTOCOL_PREFIX = b"APEXCAD:"
+
+# Frame header on the data channel: big-endian payload length + format tag
+_FRAME_HEADER = struct.Struct(">Ic")
+
+# Queued by the frame reader when the worker finishes a job's records
+_END_OF_JOB = object()
+
+# Number of trailing output lines kept for error reports
+_OUTPUT_TAIL_LINES = 40
+
+# Threads running blocking worker exchanges for asynchronous conversions
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="apexcad")
+
+# Conversions started with convert_file_async that haven't finished yet
+_TASKS = set()
+
+# Seconds shutdown() waits for cancelled conversions to stop
+_SHUTDOWN_WAIT = 10
+
+# Successful FreeCAD validations: (path, mtime_ns, size) -> (True, version)
+_VALIDATION_CACHE = {}
+
+# Temp dirs left by sessions that didn't shut down cleanly are removed
+# once they have been idle this long (seconds)
+_STALE_TEMP_AGE = 24 * 3600
+_stale_sweep_done = False
+
+# File in each bridge's temp dir, locked for as long as the bridge lives
+_TEMP_LOCK_NAME = ".lock"
+
+
+def clear_validation_cache():
+    """Forget cached FreeCAD validations so the next check runs --version again"""
+    _VALIDATION_CACHE.clear()
+
+
+def _spawn_kwargs():
+    """
+    Popen arguments shared by every FreeCAD launch
+    close_fds keeps Blender's descriptors (GPU, files, sockets) out of the
+    child; on POSIX the child also gets its own session so terminal signals
+    aimed at Blender don't hit it.
+    """
+    if os.name == 'nt':
+        return {'close_fds': True}
+    return {'close_fds': True, 'start_new_session': True}
+
+
+def _try_lock(f):
+    """Take a non-blocking exclusive lock on an open file; False if it is held"""
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _held_by_live_bridge(temp_dir):
+    """Whether another bridge (in any Blender instance) still holds temp_dir's lock"""
+    try:
+        # r+b never creates the file, so checking leaves stale dirs untouched
+        f = open(os.path.join(temp_dir, _TEMP_LOCK_NAME), 'r+b')
+    except FileNotFoundError:
+        # No lock file: left by a crashed or older session
+        return False
+    except OSError:
+        # Unreadable lock: keep the dir rather than guess
+        return True
+    with f:
+        return not _try_lock(f)
+
+
+def _sweep_stale_temp_dirs():
+    """
+    Remove apexcad_* temp dirs whose newest job activity is over a day old
+    Dirs whose lock is still held belong to a running bridge, possibly in
+    another Blender instance that has been idle that long, and are kept.
+    """
+    cutoff = time.time() - _STALE_TEMP_AGE
+    try:
+        entries = list(os.scandir(tempfile.gettempdir()))
+    except OSError:
+        return
+    for entry in entries:
+        if not entry.name.startswith("apexcad_") or not entry.is_dir(follow_symlinks=False):
+            continue
+        try:
+            # Job slots are reused, so a live bridge touches its job dirs,
+            # not necessarily the top-level directory
+            newest = entry.stat(follow_symlinks=False).st_mtime
+            with os.scandir(entry.path) as jobs:
+                for job in jobs:
+                    newest = max(newest, job.stat(follow_symlinks=False).st_mtime)
+        except OSError:
+            continue
+        if newest < cutoff and not _held_by_live_bridge(entry.path):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def validate_executable(freecad_path):
+    """Run 'freecad --version' once per binary; successes are cached"""
+    st = _stat_or_none(freecad_path)
+    if st is None:
+        return False, "FreeCAD executable not found"
+    cache_key = (freecad_path, st.st_mtime_ns, st.st_size)
+    
+    cached = _VALIDATION_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    try:
+        # Test FreeCAD execution
+        print(f"ApexCad: Validating FreeCAD at {freecad_path}")
+        result = subprocess.run(
+            [freecad_path, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+            **_spawn_kwargs()
+        )
+        if result.returncode == 0:
+            version = result.stdout.strip()
+            print(f"ApexCad: FreeCAD validation OK - {version}")
+            _VALIDATION_CACHE[cache_key] = (True, version)
+            return True, version
+        return False, f"Failed to execute FreeCAD (code {result.returncode})"
+    except subprocess.TimeoutExpired:
+        return False, "FreeCAD validation timeout (>10s)"
+    except Exception as e:
+        return False, str(e)
+
+
+def _stat_or_none(path):
+    """os.stat() that returns None instead of raising for missing paths"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _build_hierarchy(records):
+    """Assemble the hierarchy from the records streamed by the worker
+    
+    Records are a header (scale, y_up, buffers), one record per object and
+    a final {"__root__": [...]} record. Children lists are rebuilt from each
+    object's parent.
+    """
+    hierarchy = records[0]
+    objects = []
+    root_objects = []
+    for record in records[1:]:
+        if '__root__' in record:
+            root_objects = record['__root__']
+        else:
+            record['children'] = []
+            objects.append(record)
+    
+    by_name = {obj['internal_name']: obj for obj in objects}
+    for obj in objects:
+        parent = by_name.get(obj['parent'])
+        if parent is not None:
+            parent['children'].append(obj['internal_name'])
+    
+    hierarchy['objects'] = objects
+    hierarchy['root_objects'] = root_objects
+    return hierarchy
+
+
+def _pump_frames(stream, records):
+    """Decode length-prefixed hierarchy frames from the worker's data channel
+    
+    Frames are msgpack or JSON according to their tag. Each record is
+    parsed as soon as it arrives, overlapping decoding with FreeCAD's
+    processing. A zero-length frame ends a job and queues
+    _END_OF_JOB; None is queued once the channel closes.
+    """
+    try:
+        while True:
+            header = stream.read(_FRAME_HEADER.size)
+            if len(header) < _FRAME_HEADER.size:
+                break
+            size, tag = _FRAME_HEADER.unpack(header)
+            if size == 0:
+                records.put(_END_OF_JOB)
+                continue
+            
+            frame = bytearray(size)
+            view = memoryview(frame)
+            received = 0
+            while received < size:
+                n = stream.readinto(view[received:])
+                if not n:
+                    break
+                received += n
+            if received < size:
+                break
+            if tag == b"M":
+                records.put(msgpack.unpackb(frame, raw=False, strict_map_key=False))
+            else:
+                records.put(_json_loads(frame))
+    except (OSError, ValueError):
+        pass
+    finally:
+        try:
+            stream.close()
+        except OSError:
+            pass
+        records.put(None)
+
+
+def _pump_output(stream, chunks):
+    """Drain a pipe in large reads until EOF (runs on a helper thread)"""
+    fd = stream.fileno()
+    try:
+        while True:
+            data = os.read(fd, _READ_CHUNK)
+            if not data:
+                break
+            chunks.put(data)
+    except OSError:
+        pass
+    finally:
+        chunks.put(None)
+
+
+class ConversionTask:
+    """
+    A conversion running on a background thread (see convert_file_async)
+    
+    Blender polls done() from a modal operator or timer; progress is
+    written by the conversion thread. cancel() only sets a token: the job
+    notices it before starting and while waiting on FreeCAD, and kills the
+    worker only while the job itself owns it.
+    """
+    
+    def __init__(self):
+        self.future = None
+        self.cancel_event = threading.Event()
+        self.progress = (0, 0)  # (done, total) objects
+    
+    def _on_progress(self, done, total):
+        self.progress = (done, total)
+    
+    def done(self):
+        return self.future.done()
+    
+    def cancel(self):
+        self.cancel_event.set()
+        self.future.cancel()
+    
+    def cancelled(self):
+        return self.cancel_event.is_set()
+    
+    def result(self):
+        """The convert_file_sync result dict (only once done())"""
+        return self.future.result()
+
 
 class FreeCADBridge:
     """
@@ -24,37 +314,38 @@ class FreeCADBridge:
     def __init__(self, freecad_path):
         self.freecad_path = freecad_path
         self.temp_dir = tempfile.mkdtemp(prefix="apexcad_")
-        self.process_queue = queue.Queue()
-        self.result_queue = queue.Queue()
+        self.validated = False
         
-    def validate_freecad(self):
-        """Check if FreeCAD executable is valid"""
-        if not os.path.exists(self.freecad_path):
-            return False, "FreeCAD executable not found"
+        # Held until cleanup() so other sessions' stale sweeps skip temp_dir
+        self._temp_lock = open(os.path.join(self.temp_dir, _TEMP_LOCK_NAME), 'wb')
+        _try_lock(self._temp_lock)
         
-        try:
-            # Test FreeCAD execution
-            print(f"ApexCad: Validating FreeCAD at {self.freecad_path}")
-            result = subprocess.run(
-                [self.freecad_path, "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                print(f"ApexCad: FreeCAD validation OK - {version}")
-                return True, version
-            return False, f"Failed to execute FreeCAD (code {result.returncode})"
-        except subprocess.TimeoutExpired:
-            return False, "FreeCAD validation timeout (>10s)"
-        except Exception as e:
-            return False, str(e)
+        # Job output directories inside temp_dir, recycled between imports
+        self._slot_counter = 0
+        self._free_slots = []
+        self._slot_lock = threading.Lock()
+        
+        # Persistent FreeCAD worker, started on the first conversion
+        self._worker = None
+        self._worker_output = None
+        self._worker_pending = bytearray()
+        self._worker_records = None
+        self._worker_lock = threading.Lock()
+        
+    def validate_freecad(self):
+        """
+        Check if FreeCAD executable is valid
+        Successful results are cached per path and binary mtime, so the
+        --version subprocess only runs again when FreeCAD is replaced.
+        """
+        is_valid, message = validate_executable(self.freecad_path)
+        if is_valid:
+            self.validated = True
+        return is_valid, message
     
-    def generate_conversion_script(self, input_file, output_dir, options):
+    def build_job(self, input_file, output_dir, options):
         """
-        Generate Python script for FreeCAD to execute
+        Build the job sent to the FreeCAD worker
         
         Args:
             input_file: Path to STEP/IGES file
@@ -62,272 +353,303 @@ class FreeCADBridge:
             options: Dict with conversion options (scale, y_up, etc.)
         
         Returns:
-            Path to generated script
+            Dict serialized as one JSON line on the worker's stdin
         """
-        # Build script content using string concatenation to avoid f-string nesting issues
-        script_lines = [
-            'import FreeCAD',
-            'import Import',
-            'import Mesh',
-            'import os',
-            'import json',
-            'import time',
-            '',
-            '# Configuration',
-            f'input_file = r"{input_file}"',
-            f'output_dir = r"{output_dir}"',
-            f'scale_factor = {options.get("scale", 1.0)}',
-            f'y_up = {options.get("y_up", True)}',
-            f'tessellation_quality = {options.get("tessellation_quality", 0.1)}',
-            '',
-            'print("=" * 60)',
-            'print("FREECAD CONVERSION SCRIPT")',
-            'print("=" * 60)',
-            'print("Archivo: " + input_file)',
-            'print("Iniciando a las " + time.strftime("%H:%M:%S"))',
-            'print("=" * 60)',
-            '',
-            '# Import the CAD file',
-            'try:',
-            '    print("\\n[PASO 1/4] Creando documento FreeCAD...")',
-            '    t_start = time.time()',
-            '    doc = FreeCAD.newDocument("ApexCadImport")',
-            '    print("  OK - Documento creado en {:.2f}s".format(time.time()-t_start))',
-            '    ',
-            '    # Import STEP or IGES',
-            '    print("\\n[PASO 2/4] Importando archivo CAD...")',
-            '    print("  Esto puede tomar varios minutos...")',
-            '    file_ext = os.path.splitext(input_file)[1].lower()',
-            '    t_import = time.time()',
-            '    ',
-            '    if file_ext in [".stp", ".step"]:',
-            '        Import.insert(input_file, "ApexCadImport")',
-            '    elif file_ext in [".igs", ".iges"]:',
-            '        Import.insert(input_file, "ApexCadImport")',
-            '    else:',
-            '        raise ValueError("Unsupported file format: " + file_ext)',
-            '    ',
-            '    import_time = time.time() - t_import',
-            '    print("  OK - Archivo importado in {:.2f}s".format(import_time))',
-            '    print("  Objetos cargados: {}".format(len(doc.Objects)))',
-            '    ',
-            '    # Process objects',
-            '    print("\\n[PASO 3/4] Procesando {} objetos...".format(len(doc.Objects)))',
-            '    t_process = time.time()',
-            '    ',
-            '    hierarchy_data = {',
-            '        "objects": [],',
-            '        "root_objects": [],',
-            '        "scale": scale_factor,',
-            '        "y_up": y_up',
-            '    }',
-            '    ',
-            '    object_map = {}',
-            '    ',
-            '    # Datum objects to skip (reference planes, axes, origins)',
-            '    datum_types = ["App::Origin", "App::Plane", "App::Line", "PartDesign::Plane", "PartDesign::Line", "PartDesign::Point"]',
-            '    datum_names = ["Origin", "X-axis", "Y-axis", "Z-axis", "XY-plane", "XZ-plane", "YZ-plane"]',
-            '    ',
-            '    for idx, obj in enumerate(doc.Objects):',
-            '        # Skip datum/reference objects completely',
-            '        if obj.TypeId in datum_types:',
-            '            continue',
-            '        if obj.Label in datum_names or obj.Label.endswith(("001", "002", "003")) and any(obj.Label.startswith(d.replace("-", "")) for d in datum_names):',
-            '            # Skip Origin001, X-axis002, etc.',
-            '            continue',
-            '        ',
-            '        if idx % 10 == 0 and idx > 0:',
-            '            print("  Procesando objeto {}/{}...".format(idx, len(doc.Objects)))',
-            '        ',
-            '        obj_data = {',
-            '            "name": obj.Label,',
-            '            "internal_name": obj.Name,',
-            '            "type": obj.TypeId,',
-            '            "index": idx,',
-            '            "metadata": {},',
-            '            "parent": None,',
-            '            "children": []',
-            '        }',
-            '        ',
-            '        # Extract metadata',
-            '        if hasattr(obj, "Shape"):',
-            '            shape = obj.Shape',
-            '            obj_data["metadata"]["volume"] = shape.Volume if hasattr(shape, "Volume") else 0',
-            '            obj_data["metadata"]["area"] = shape.Area if hasattr(shape, "Area") else 0',
-            '            ',
-            '            try:',
-            '                bbox = shape.BoundBox',
-            '                obj_data["metadata"]["bbox"] = {',
-            '                    "min": [bbox.XMin, bbox.YMin, bbox.ZMin],',
-            '                    "max": [bbox.XMax, bbox.YMax, bbox.ZMax]',
-            '                }',
-            '            except:',
-            '                pass',
-            '        ',
-            '        # Extract color/material information',
-            '        if hasattr(obj, "ViewObject") and obj.ViewObject:',
-            '            vobj = obj.ViewObject',
-            '            ',
-            '            # Try to get shape color (STEP files often have colors)',
-            '            if hasattr(vobj, "ShapeColor"):',
-            '                color = vobj.ShapeColor',
-            '                # FreeCAD colors are tuples (r, g, b) in 0-1 range',
-            '                obj_data["metadata"]["color"] = [color[0], color[1], color[2], 1.0]',
-            '            ',
-            '            # Try to get diffuse color',
-            '            elif hasattr(vobj, "DiffuseColor") and vobj.DiffuseColor:',
-            '                # DiffuseColor is per-face, take first color',
-            '                color = vobj.DiffuseColor[0] if vobj.DiffuseColor else None',
-            '                if color:',
-            '                    obj_data["metadata"]["color"] = [color[0], color[1], color[2], color[3]]',
-            '        ',
-            '        # Extract standard CAD properties',
-            '        if hasattr(obj, "Description"):',
-            '            obj_data["metadata"]["description"] = obj.Description',
-            '        if hasattr(obj, "Material") and isinstance(obj.Material, str):',
-            '            obj_data["metadata"]["material_name"] = obj.Material',
-            '        ',
-            '        # Get position',
-            '        if hasattr(obj, "Placement"):',
-            '            placement = obj.Placement',
-            '            pos = placement.Base',
-            '            rot = placement.Rotation',
-            '            obj_data["transform"] = {',
-            '                "position": [pos.x, pos.y, pos.z],',  # NO aplicar scale aquí
-            '                "rotation": [rot.Q[0], rot.Q[1], rot.Q[2], rot.Q[3]]',
-            '            }',
-            '        ',
-            '        # Get parent relationship',
-            '        # First try using Parents property',
-            '        if hasattr(obj, "Parents") and obj.Parents:',
-            '            parent = obj.Parents[0][0]',
-            '            obj_data["parent"] = parent.Name',
-            '        ',
-            '        # Determine if this is a leaf object (actual geometry) or container',
-            '        is_leaf = True',
-            '        if hasattr(obj, "Group") and obj.Group:',
-            '            is_leaf = False',
-            '        obj_data["is_leaf"] = is_leaf',
-            '        ',
-            '        # Export mesh ONLY for leaf objects with actual geometry',
-            '        if hasattr(obj, "Shape") and obj.Shape.Faces and is_leaf:',
-            '            mesh_file = os.path.join(output_dir, obj.Name + ".obj")',
-            '            try:',
-            '                obj.Shape.tessellate(tessellation_quality)',
-            '                ',
-            '                # Export individual object using MeshPart for better separation',
-            '                import MeshPart',
-            '                mesh = MeshPart.meshFromShape(obj.Shape, LinearDeflection=tessellation_quality, AngularDeflection=0.5, Relative=False)',
-            '                mesh.write(mesh_file, "OBJ", obj.Name)',
-            '                ',
-            '                obj_data["mesh_file"] = mesh_file',
-            '                print("  Exported: {} (leaf object)".format(obj.Label))',
-            '            except Exception as e:',
-            '                print("  Warning - Failed to export {}: {}".format(obj.Label, str(e)))',
-            '                obj_data["mesh_file"] = None',
-            '        else:',
-            '            obj_data["mesh_file"] = None',
-            '            if not is_leaf:',
-            '                print("  Container: {}".format(obj.Label))',
-            '        ',
-            '        hierarchy_data["objects"].append(obj_data)',
-            '        object_map[obj.Name] = obj_data',
-            '    ',
-            '    # Build hierarchy from Group property (used by App::Part)',
-            '    for obj in doc.Objects:',
-            '        if hasattr(obj, "Group") and obj.Group:',
-            '            for child in obj.Group:',
-            '                if child.Name in object_map:',
-            '                    child_data = object_map[child.Name]',
-            '                    if not child_data.get("parent"):',
-            '                        child_data["parent"] = obj.Name',
-            '    ',
-            '    # Build children lists',
-            '    for obj_data in hierarchy_data["objects"]:',
-            '        if obj_data["parent"]:',
-            '            parent_data = object_map.get(obj_data["parent"])',
-            '            if parent_data:',
-            '                parent_data["children"].append(obj_data["internal_name"])',
-            '        else:',
-            '            hierarchy_data["root_objects"].append(obj_data["internal_name"])',
-            '    ',
-            '    process_time = time.time() - t_process',
-            '    print("  OK - Procesamiento completado in {:.2f}s".format(process_time))',
-            '    ',
-            '    # Save hierarchy data',
-            '    print("\\n[PASO 4/4] Guardando datos...")',
-            '    t_save = time.time()',
-            '    hierarchy_file = os.path.join(output_dir, "hierarchy.json")',
-            '    with open(hierarchy_file, "w") as f:',
-            '        json.dump(hierarchy_data, f, indent=2)',
-            '    save_time = time.time() - t_save',
-            '    print("  OK - Guardado en {:.2f}s".format(save_time))',
-            '    ',
-            '    total_time = time.time() - t_start',
-            '    print("\\n" + "=" * 60)',
-            '    print("CONVERSION EXITOSA")',
-            '    print("Tiempo total: {:.2f}s".format(total_time))',
-            '    print("  - Importacion STEP: {:.2f}s".format(import_time))',
-            '    print("  - Procesamiento: {:.2f}s".format(process_time))',
-            '    print("  - Guardado: {:.2f}s".format(save_time))',
-            '    print("Objetos procesados: {}".format(len(hierarchy_data["objects"])))',
-            '    print("=" * 60)',
-            '    ',
-            '    FreeCAD.closeDocument("ApexCadImport")',
-            '    ',
-            'except Exception as e:',
-            '    print("ERROR: " + str(e))',
-            '    import traceback',
-            '    traceback.print_exc()',
-            '    exit(1)',
-        ]
-        
-        script_content = '\n'.join(script_lines)
-        
-        script_path = os.path.join(self.temp_dir, "convert_script.py")
-        with open(script_path, 'w') as f:
-            f.write(script_content)
-        
-        return script_path
+        return {
+            'input_file': input_file,
+            'output_dir': output_dir,
+            'scale': options.get('scale', 1.0),
+            'y_up': options.get('y_up', True),
+            'tessellation_quality': options.get('tessellation_quality', 0.1),
+            'tessellation_workers': options.get('tessellation_workers', 1),
+            'extract_metadata': options.get('extract_metadata', False),
+            'msgpack': msgpack is not None,
+        }
+    
+    def _popen_flags(self):
+        """Platform-specific flags to prevent window creation"""
+        if os.name == 'nt':  # Windows
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            return startupinfo, 0  # Sin CREATE_NO_WINDOW para diagnóstico
+        return None, 0
+    
+    def ensure_worker(self):
+        """Start the persistent FreeCAD worker unless it is already running"""
+        worker = self._worker
+        if worker is not None and worker.poll() is None:
+            return worker
+        
+        startupinfo, creation_flags = self._popen_flags()
+        print(f"ApexCad: Iniciando worker FreeCAD: {self.freecad_path} -c {WORKER_SCRIPT}")
+        
+        # Dedicated pipe for hierarchy frames, kept apart from FreeCAD's output
+        data_read, data_write = os.pipe()
+        env = dict(os.environ)
+        spawn_kwargs = _spawn_kwargs()
+        if os.name == 'nt':
+            import msvcrt
+            handle = msvcrt.get_osfhandle(data_write)
+            os.set_handle_inheritable(handle, True)
+            if startupinfo is None:
+                startupinfo = subprocess.STARTUPINFO()
+            startupinfo.lpAttributeList = {'handle_list': [handle]}
+            env['APEXCAD_DATA_HANDLE'] = str(handle)
+        else:
+            spawn_kwargs['pass_fds'] = (data_write,)
+            env['APEXCAD_DATA_FD'] = str(data_write)
+        
+        try:
+            worker = subprocess.Popen(
+                [self.freecad_path, "-c", WORKER_SCRIPT],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                startupinfo=startupinfo,
+                creationflags=creation_flags,
+                env=env,
+                **spawn_kwargs
+            )
+        except Exception:
+            os.close(data_read)
+            raise
+        finally:
+            # Only the worker keeps the write end, so its exit closes the channel
+            os.close(data_write)
+        
+        # Pipes cannot be polled with select() on Windows, so a helper thread
+        # drains the worker's output and the calling thread consumes the chunks
+        self._worker_output = queue.Queue()
+        self._worker_pending = bytearray()
+        reader = threading.Thread(
+            target=_pump_output,
+            args=(worker.stdout, self._worker_output),
+            daemon=True
+        )
+        reader.start()
+        
+        self._worker_records = queue.Queue()
+        frame_reader = threading.Thread(
+            target=_pump_frames,
+            args=(os.fdopen(data_read, 'rb'), self._worker_records),
+            daemon=True
+        )
+        frame_reader.start()
+        
+        self._worker = worker
+        return worker
     
-    def convert_file_async(self, input_file, output_dir, options, callback=None):
+    def stop_worker(self, kill=False):
+        """Stop the persistent FreeCAD worker (closing stdin ends its job loop)"""
+        worker = self._worker
+        if worker is None:
+            return
+        self._worker = None
+        
+        try:
+            if not kill:
+                worker.stdin.close()
+                try:
+                    worker.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    kill = True
+            if kill:
+                worker.kill()
+                worker.wait()
+        except OSError:
+            pass
+        finally:
+            for pipe in (worker.stdin, worker.stdout):
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
+    
+    def convert_file_async(self, input_file, output_dir, options):
         """
-        Convert CAD file asynchronously
+        Convert CAD file on a background thread
         
         Args:
             input_file: Path to STEP/IGES file
             output_dir: Output directory
             options: Conversion options
-            callback: Function to call when complete (result_dict)
+        
+        Returns:
+            ConversionTask; poll done() from Blender's main thread, then
+            read result() (the convert_file_sync dict)
         """
-        def _run_conversion():
-            result = self.convert_file_sync(input_file, output_dir, options)
-            if callback:
-                callback(result)
-            self.result_queue.put(result)
-        
-        thread = threading.Thread(target=_run_conversion, daemon=True)
-        thread.start()
-        return thread
+        task = ConversionTask()
+        task.future = _EXECUTOR.submit(
+            self.convert_file_sync, input_file, output_dir, options,
+            task._on_progress, task.cancel_event
+        )
+        _TASKS.add(task)
+        task.future.add_done_callback(lambda _: _TASKS.discard(task))
+        return task
+    
+    def _run_job(self, job, timeout, progress_callback=None, verbose=True, cancel_event=None):
+        """
+        Send one job to the worker and wait for its reply
+        
+        Output is read in large chunks and only a short tail is kept for
+        error reports; with verbose, each chunk's lines are echoed in one
+        print. Progress markers are forwarded to progress_callback. On
+        timeout the worker is killed and restarted by the next job. Setting
+        cancel_event stops the job: before it starts, or by killing the
+        worker this job holds.
+        
+        Returns:
+            (status, payload, output_tail) where status is 'DONE' (payload is
+            the list of hierarchy records), 'ERROR' (payload is the message),
+            'EXITED' (payload is the worker's return code) or 'CANCELLED'
+        """
+        with self._worker_lock:
+            if cancel_event is not None and cancel_event.is_set():
+                return 'CANCELLED', None, []
+            worker = self.ensure_worker()
+            chunks = self._worker_output
+            records = self._worker_records
+            pending = self._worker_pending
+            tail = deque(maxlen=_OUTPUT_TAIL_LINES)
+            echo = [] if verbose else None
+            deadline = time.monotonic() + timeout
+            
+            try:
+                worker.stdin.write(json.dumps(job).encode('utf-8') + b"\n")
+                worker.stdin.flush()
+            except OSError:
+                # Worker died between jobs; its output explains why
+                pass
+            
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    # The lock is held, so the worker is running this job
+                    self.stop_worker(kill=True)
+                    return 'CANCELLED', None, list(tail)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stop_worker(kill=True)
+                    raise subprocess.TimeoutExpired(worker.args, timeout)
+                try:
+                    data = chunks.get(timeout=min(remaining, 0.5))
+                except queue.Empty:
+                    continue
+                
+                if data is None:
+                    if pending:
+                        self._handle_output_line(bytes(pending), tail, progress_callback, echo)
+                        pending.clear()
+                    if echo:
+                        print('\n'.join(echo))
+                    returncode = worker.wait()
+                    self.stop_worker()
+                    return 'EXITED', returncode, list(tail)
+                
+                pending += data
+                start = 0
+                reply = None
+                while reply is None:
+                    end = pending.find(b"\n", start)
+                    if end < 0:
+                        break
+                    reply = self._handle_output_line(bytes(pending[start:end]), tail, progress_callback, echo)
+                    start = end + 1
+                del pending[:start]
+                
+                if echo:
+                    print('\n'.join(echo))
+                    echo.clear()
+                
+                if reply is not None:
+                    break
+            
+            # The worker ends every job's records before replying, so all of
+            # this job's frames are queued or about to be
+            received = []
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    # The lock is held, so the worker is running this job
+                    self.stop_worker(kill=True)
+                    return 'CANCELLED', None, list(tail)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stop_worker(kill=True)
+                    raise subprocess.TimeoutExpired(worker.args, timeout)
+                try:
+                    record = records.get(timeout=min(remaining, 0.5))
+                except queue.Empty:
+                    continue
+                if record is _END_OF_JOB:
+                    break
+                if record is None:
+                    self.stop_worker()
+                    return 'ERROR', "Hierarchy data channel closed", list(tail)
+                received.append(record)
+            
+            if reply[0] == 'DONE':
+                return 'DONE', received, list(tail)
+            return reply[0], reply[1], list(tail)
+    
+    def _handle_output_line(self, raw_line, tail, progress_callback, echo=None):
+        """
+        Record one line of worker output or dispatch a protocol line
+        Console lines are appended to echo when it is a list.
+        
+        Returns:
+            (kind, payload) for DONE/ERROR replies, otherwise None
+        """
+        if not raw_line.startswith(_PROTOCOL_PREFIX):
+            line = raw_line.decode('utf-8', errors='replace').rstrip('\r')
+            tail.append(line)
+            if echo is not None:
+                echo.append(line)
+            return None
+        
+        message = raw_line[len(_PROTOCOL_PREFIX):].decode('utf-8', errors='replace').rstrip('\r')
+        kind, _, payload = message.partition(' ')
+        
+        if kind == 'PROGRESS':
+            try:
+                done, total = (int(v) for v in payload.split())
+            except ValueError:
+                return None
+            if echo is not None:
+                echo.append(f"  Procesando objeto {done}/{total}...")
+            if progress_callback:
+                progress_callback(done, total)
+            return None
+        
+        return kind, payload
     
-    def convert_file_sync(self, input_file, output_dir, options):
+    def convert_file_sync(self, input_file, output_dir, options, progress_callback=None, cancel_event=None):
         """
         Convert CAD file synchronously (blocking)
         
+        Args:
+            input_file: Path to STEP/IGES file
+            output_dir: Output directory
+            options: Conversion options; 'verbose' (default True) echoes
+                FreeCAD's live output to the console
+            progress_callback: Optional function(done, total) called from the
+                calling thread while FreeCAD processes objects
+            cancel_event: Optional threading.Event; setting it stops the job
+        
         Returns:
             Dict with conversion results
         """
         start_time = time.time()
+        verbose = options.get('verbose', True)
         
-        # Validate input file
-        if not os.path.exists(input_file):
+        # Validate input file (one stat for existence and size)
+        st = _stat_or_none(input_file)
+        if st is None:
             return {
                 'success': False,
                 'error': f"Input file not found: {input_file}"
             }
         
-        file_size_mb = os.path.getsize(input_file) / (1024 * 1024)  # MB
-        file_size_kb = os.path.getsize(input_file) / 1024  # KB
+        file_size_mb = st.st_size / (1024 * 1024)  # MB
+        file_size_kb = st.st_size / 1024  # KB
         print(f"\n{'='*60}")
         print(f"ApexCad: INICIANDO CONVERSIÓN")
         print(f"Archivo: {os.path.basename(input_file)}")
@@ -337,66 +659,63 @@ class FreeCADBridge:
         
         os.makedirs(output_dir, exist_ok=True)
         
-        # Generate conversion script
+        # Build the job for the persistent worker
         script_start = time.time()
-        script_path = self.generate_conversion_script(input_file, output_dir, options)
+        job = self.build_job(input_file, output_dir, options)
         script_time = time.time() - script_start
-        print(f"[{script_time:.2f}s] Script generado: {script_path}")
         
         try:
-            # Execute FreeCAD with platform-specific flags
+            # Run the job on the persistent FreeCAD worker
             exec_start = time.time()
             
             # Dynamic timeout based on file size (generoso para diagnóstico)
             timeout = 180 if file_size_mb < 1 else min(600, 180 + int(file_size_mb * 60))
             
-            print(f"\n[{time.time() - start_time:.2f}s] Ejecutando FreeCAD...")
-            print(f"Comando: {self.freecad_path} -c {script_path}")
+            print(f"\n[{time.time() - start_time:.2f}s] Enviando trabajo a FreeCAD...")
             print(f"Timeout: {timeout}s\n")
-            print("="*60)
-            print("SALIDA DE FREECAD EN VIVO:")
-            print("="*60)
+            if verbose:
+                print("="*60 + "\nSALIDA DE FREECAD EN VIVO:\n" + "="*60)
             
-            # Platform-specific flags to prevent window creation
-            if os.name == 'nt':  # Windows
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                creation_flags = 0  # Sin CREATE_NO_WINDOW para diagnóstico
-            else:  # Linux/Mac
-                startupinfo = None
-                creation_flags = 0
+            status, payload, output_tail = self._run_job(job, timeout, progress_callback, verbose, cancel_event)
             
-            # Sin capture_output para ver salida en tiempo real
-            result = subprocess.run(
-                [self.freecad_path, "-c", script_path],
-                stdin=subprocess.DEVNULL,
-                timeout=timeout,
-                startupinfo=startupinfo,
-                creationflags=creation_flags
-            )
+            if status == 'CANCELLED':
+                print(f"\n[{time.time() - start_time:.2f}s] Conversión cancelada")
+                return {
+                    'success': False,
+                    'cancelled': True,
+                    'error': "Conversion cancelled",
+                }
             
             exec_time = time.time() - exec_start
-            print("="*60)
+            if verbose:
+                print("="*60)
+            elif status != 'DONE' or not payload:
+                # Output wasn't echoed live; show what led to the failure
+                print('\n'.join(output_tail))
             print(f"\n[{time.time() - start_time:.2f}s] FreeCAD terminó en {exec_time:.2f}s")
-            print(f"Código de retorno: {result.returncode}")
             
             # Check for errors
-            if result.returncode != 0:
-                print(f"\n❌ ERROR: FreeCAD falló con código {result.returncode}")
+            if status == 'EXITED':
+                print(f"\n❌ ERROR: El worker de FreeCAD terminó con código {payload}")
                 return {
                     'success': False,
-                    'error': f"FreeCAD conversion failed (code {result.returncode})",
-                    'output': ''
+                    'error': f"FreeCAD conversion failed (code {payload})",
+                    'output': '\n'.join(output_tail)
+                }
+            if status != 'DONE':
+                print(f"\n❌ ERROR: FreeCAD falló: {payload}")
+                return {
+                    'success': False,
+                    'error': f"FreeCAD conversion failed: {payload}",
+                    'output': '\n'.join(output_tail)
                 }
             
-            # Load hierarchy data
+            # Assemble hierarchy data (records were decoded while FreeCAD ran)
             load_start = time.time()
-            hierarchy_file = os.path.join(output_dir, "hierarchy.json")
             print(f"[{time.time() - start_time:.2f}s] Cargando datos de jerarquía...")
             
-            if os.path.exists(hierarchy_file):
-                with open(hierarchy_file, 'r') as f:
-                    hierarchy_data = json.load(f)
+            if payload:
+                hierarchy_data = _build_hierarchy(payload)
                 
                 load_time = time.time() - load_start
                 total_time = time.time() - start_time
@@ -408,7 +727,7 @@ class FreeCADBridge:
                 print(f"✓ CONVERSIÓN COMPLETA")
                 print(f"Objetos procesados: {num_objects}")
                 print(f"Tiempo total: {total_time:.2f}s")
-                print(f"  - Generación script: {script_time:.2f}s")
+                print(f"  - Preparación trabajo: {script_time:.2f}s")
                 print(f"  - Ejecución FreeCAD: {exec_time:.2f}s")
                 print(f"  - Carga jerarquía: {load_time:.2f}s")
                 print(f"{'='*60}\n")
@@ -417,7 +736,6 @@ class FreeCADBridge:
                     'success': True,
                     'hierarchy': hierarchy_data,
                     'output_dir': output_dir,
-                    'output': '',
                     'timing': {
                         'total': total_time,
                         'script_gen': script_time,
@@ -426,13 +744,11 @@ class FreeCADBridge:
                     }
                 }
             else:
-                print(f"\n❌ ERROR: Archivo hierarchy.json no fue generado")
-                print(f"Directorio de salida: {output_dir}")
-                print(f"Archivos presentes: {os.listdir(output_dir)}")
+                print(f"\n❌ ERROR: No se recibieron datos de jerarquía")
                 return {
                     'success': False,
-                    'error': "Hierarchy file not generated",
-                    'output': ''
+                    'error': "Hierarchy data not received",
+                    'output': '\n'.join(output_tail)
                 }
         
         except subprocess.TimeoutExpired:
@@ -452,30 +768,115 @@ class FreeCADBridge:
                 'error': f"Conversion error: {str(e)}",
             }
     
-    def cleanup(self):
-        """Clean up temporary files"""
-        import shutil
-        if os.path.exists(self.temp_dir):
+    def allocate_job_dir(self):
+        """
+        Hand out an empty job directory inside temp_dir
+        Reuses the lowest released slot before creating a new one.
+        """
+        with self._slot_lock:
+            if self._free_slots:
+                slot = heapq.heappop(self._free_slots)
+            else:
+                slot = self._slot_counter
+                self._slot_counter += 1
+        
+        job_dir = os.path.join(self.temp_dir, f"job_{slot:06d}")
+        os.makedirs(job_dir, exist_ok=True)
+        return job_dir
+    
+    def release_job_dir(self, job_dir):
+        """Empty a job directory and return its slot to the pool"""
+        try:
+            entries = os.listdir(job_dir)
+        except OSError:
+            # temp_dir was purged underneath a long-lived bridge
+            entries = []
+        for entry in entries:
             try:
-                shutil.rmtree(self.temp_dir)
-            except:
+                os.remove(os.path.join(job_dir, entry))
+            except OSError:
                 pass
+        
+        slot = int(os.path.basename(job_dir)[len("job_"):])
+        with self._slot_lock:
+            heapq.heappush(self._free_slots, slot)
+    
+    def cleanup(self):
+        """
+        Stop the FreeCAD worker and clean up temporary files
+        The directory is removed on a background thread: rmtree can take
+        seconds on Windows with a virus scanner and the caller is usually the
+        UI. The thread is not a daemon, so interpreter exit waits for it.
+        """
+        self.stop_worker()
+        # Windows cannot delete the lock file while it is open
+        self._temp_lock.close()
+        threading.Thread(
+            target=shutil.rmtree,
+            args=(self.temp_dir,),
+            kwargs={'ignore_errors': True},
+            name="apexcad-cleanup",
+        ).start()
+
+
+# Bridge shared across imports so its FreeCAD worker stays alive
+_bridge = None
 
 
 def get_bridge(context):
     """Get or create FreeCAD bridge instance"""
+    global _bridge, _stale_sweep_done
     prefs = context.preferences.addons[__package__.split('.')[0]].preferences
     
     if not prefs.freecad_path:
         return None, "FreeCAD path not configured. Check addon preferences."
     
-    if not os.path.exists(prefs.freecad_path):
-        return None, f"FreeCAD not found at: {prefs.freecad_path}"
+    # Existence is checked by validate_freecad (a single stat)
+    if _bridge is not None and _bridge.freecad_path == prefs.freecad_path:
+        if _bridge.validated:
+            return _bridge, None
+        bridge = _bridge
+    else:
+        shutdown()
+        bridge = FreeCADBridge(prefs.freecad_path)
+        
+        if not _stale_sweep_done:
+            _stale_sweep_done = True
+            _EXECUTOR.submit(_sweep_stale_temp_dirs)
     
-    bridge = FreeCADBridge(prefs.freecad_path)
     is_valid, message = bridge.validate_freecad()
     
     if not is_valid:
+        if bridge is _bridge:
+            shutdown()
+        else:
+            bridge.cleanup()
         return None, f"FreeCAD validation failed: {message}"
     
+    _bridge = bridge
     return bridge, None
+
+
+def prewarm(freecad_path):
+    """
+    Validate FreeCAD in the background before the first import
+    Besides filling the validation cache this pulls FreeCAD's binaries into
+    the OS page cache, so the worker's cold start is shorter.
+    """
+    if freecad_path:
+        _EXECUTOR.submit(validate_executable, freecad_path)
+
+
+def shutdown():
+    """Stop the shared bridge, its FreeCAD worker and pending async conversions"""
+    global _bridge
+    tasks = list(_TASKS)
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        # Running jobs stop within one output poll; wait so none of them is
+        # still using the worker or a job dir when the bridge goes away
+        _wait_futures([task.future for task in tasks], timeout=_SHUTDOWN_WAIT)
+    if _bridge is not None:
+        _bridge.cleanup()
+        _bridge = None
@@ -0,0 +1,551 @@
+"""
+FreeCAD Conversion Worker
+Executed by FreeCAD (freecad -c freecad_worker.py), not by Blender
+
+Runs as a long-lived process: every line read from stdin is a JSON job
+(input_file, output_dir, scale, y_up, tessellation_quality, ...). For each job
+the STEP/IGES file is converted into hierarchy records, streamed over the
+data channel, plus binary mesh buffers in the job's output directory, then
+a single protocol line is written to stdout:
+
+    APEXCAD:DONE
+    APEXCAD:ERROR <message>
+
+Leaf shapes are tessellated in a multiprocessing pool when the job asks
+for more than one tessellation worker (shapes are shipped to the pool as
+BREP strings); otherwise, or if the pool cannot start, they are meshed
+serially in this process.
+
+Progress is reported with APEXCAD:PROGRESS <done> <total> lines. Any other
+output is diagnostic text echoed by the bridge.
+
+Data channel: a pipe inherited from the bridge (APEXCAD_DATA_FD on POSIX,
+APEXCAD_DATA_HANDLE on Windows) carrying frames of a 4-byte big-endian
+length and a 1-byte format tag (b"M" msgpack, b"J" compact JSON) followed by
+one record. msgpack is used when the job asks for it and this FreeCAD
+has it. Per job: a header record
+(scale, y_up, buffer names), one record per object (sent as soon as the
+object is processed), a final {"__root__": [...]} record listing top-level
+objects and, always, a zero-length frame ending the job. Children lists
+are not sent; the bridge rebuilds them from each object's "parent".
+
+Mesh buffers (native byte order, normally little-endian):
+    mesh_vertices.bin   float32 x, y, z per vertex
+    mesh_triangles.bin  uint32 i, j, k per triangle, relative to the
+                        object's first vertex
+Each meshed object carries "mesh_ref": [first_vertex, vertex_count,
+first_triangle, triangle_count] indexing into those buffers.
+
+    transforms.bin      float32 x 13 per object, at the object's "slot":
+                        position xyz, rotation quaternion xyzw,
+                        bbox min xyz, bbox max xyz (NaN when unavailable)
+"""
+
+import FreeCAD
+import Import
+import Part
+import os
+from array import array
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import struct
+import sys
+import json
+import time
+import traceback
+
+try:
+    import msgpack
+except ImportError:
+    # Not every FreeCAD build ships msgpack; records fall back to JSON
+    msgpack = None
+
+
+DOC_NAME = "ApexCadImport"
+CAD_EXTENSIONS = frozenset([".stp", ".step", ".igs", ".iges"])
+
+# Consolidated mesh buffers written next to the hierarchy file
+MESH_VERTICES_FILE = "mesh_vertices.bin"
+MESH_TRIANGLES_FILE = "mesh_triangles.bin"
+
+# Per-object placement + bounding box side-car, TRANSFORM_STRIDE floats each
+TRANSFORMS_FILE = "transforms.bin"
+MESH_WRITE_BUFFER = 1 << 20
+TRANSFORM_STRIDE = 13
+NAN = float("nan")
+
+# Datum objects to skip (reference planes, axes, origins)
+DATUM_TYPES = frozenset(["App::Origin", "App::Plane", "App::Line", "PartDesign::Plane", "PartDesign::Line", "PartDesign::Point"])
+DATUM_NAMES = frozenset(["Origin", "X-axis", "Y-axis", "Z-axis", "XY-plane", "XZ-plane", "YZ-plane"])
+# Renamed copies (Origin001, XYplane002, ...) are matched by prefix + suffix
+DATUM_PREFIXES = tuple(name.replace("-", "") for name in DATUM_NAMES)
+DATUM_SUFFIXES = ("001", "002", "003")
+
+
+def is_datum_label(label):
+    """Check whether a label names a datum or one of its numbered copies"""
+    if label in DATUM_NAMES:
+        return True
+    return label.endswith(DATUM_SUFFIXES) and label.startswith(DATUM_PREFIXES)
+
+
+def open_data_channel():
+    """Open the write end of the hierarchy data pipe passed by the bridge"""
+    handle = os.environ.get("APEXCAD_DATA_HANDLE")
+    if handle is not None:
+        import msvcrt
+        fd = msvcrt.open_osfhandle(int(handle), os.O_WRONLY)
+    else:
+        fd = int(os.environ["APEXCAD_DATA_FD"])
+    return os.fdopen(fd, "wb")
+
+
+FRAME_HEADER = struct.Struct(">Ic")
+
+# Console lines are batched: stdout is a pipe and every flush is a syscall
+LOG_INTERVAL = 1.0
+LOG_MAX_LINES = 50
+_log_lines = []
+_log_last = [0.0]
+
+
+def send_record(channel, record, use_msgpack=False):
+    """Write one length-prefixed record to the data channel"""
+    if use_msgpack:
+        payload = msgpack.packb(record, use_bin_type=True)
+        channel.write(FRAME_HEADER.pack(len(payload), b"M"))
+    else:
+        payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        channel.write(FRAME_HEADER.pack(len(payload), b"J"))
+    channel.write(payload)
+
+
+def log(message):
+    """Queue a console line; the buffer is written out at most once a second"""
+    _log_lines.append(message)
+    if len(_log_lines) >= LOG_MAX_LINES or time.time() - _log_last[0] >= LOG_INTERVAL:
+        flush_log()
+
+
+def flush_log():
+    """Write all queued console lines with a single write and flush"""
+    if _log_lines:
+        sys.stdout.write("\n".join(_log_lines) + "\n")
+        del _log_lines[:]
+    sys.stdout.flush()
+    _log_last[0] = time.time()
+
+
+def emit(kind, payload=""):
+    """Send one protocol line to the bridge, after any queued console lines"""
+    _log_lines.append("APEXCAD:{} {}".format(kind, payload))
+    flush_log()
+
+
+def tessellate_shape(shape, quality):
+    """
+    Mesh one shape in a single pass with Shape.tessellate
+    
+    Returns:
+        (vertices, indices) as flat float32 / uint32 arrays
+    """
+    points, triangles = shape.tessellate(quality)
+    
+    vertices = array("f")
+    for point in points:
+        vertices.extend((point.x, point.y, point.z))
+    indices = array("I")
+    for triangle in triangles:
+        indices.extend(triangle)
+    return vertices, indices
+
+
+def _tessellate_brep(task):
+    """
+    Pool entry point: rebuild a shape from its BREP string and mesh it
+    Returns None on failure so one bad shape doesn't abort the whole map.
+    """
+    brep, quality = task
+    try:
+        shape = Part.Shape()
+        shape.importBrepFromString(brep)
+        vertices, indices = tessellate_shape(shape, quality)
+    except Exception:
+        return None
+    # Raw bytes pickle far cheaper than Python lists
+    return vertices.tobytes(), indices.tobytes()
+
+
+def _pool_context():
+    """
+    multiprocessing context for the tessellation pool, or None
+    POSIX forks, so children never re-execute the FreeCAD binary. Windows
+    can only spawn, and sys.executable there is FreeCAD, which cannot run
+    multiprocessing's bootstrap; the pool is only used when the bundled
+    python.exe next to it exists.
+    """
+    if os.name != "nt":
+        return multiprocessing.get_context("fork")
+    candidate = os.path.join(os.path.dirname(sys.executable), "python.exe")
+    if not os.path.exists(candidate):
+        return None
+    context = multiprocessing.get_context("spawn")
+    context.set_executable(candidate)
+    return context
+
+
+def tessellate_parallel(shapes, quality, workers):
+    """
+    Tessellate shapes in a process pool
+    
+    Yields one item per shape, in input order, as soon as the pool has
+    meshed it: (vertices, indices) arrays, or None when the pool could not
+    mesh that shape (the caller meshes it serially instead). If the pool
+    cannot be used or breaks, every remaining item is None. A worker that
+    dies (including one that fails to start) breaks the executor instead
+    of being silently replaced, so a bad pool never stalls the job.
+    """
+    done = 0
+    try:
+        context = _pool_context()
+        if context is None:
+            raise RuntimeError("no python.exe next to FreeCAD")
+        # BREP export stays on this thread; FreeCAD objects aren't thread-safe
+        tasks = [(shape.exportBrepToString(), quality) for shape in shapes]
+        with ProcessPoolExecutor(workers, mp_context=context) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            for blob in pool.map(_tessellate_brep, tasks, chunksize=chunksize):
+                done += 1
+                if blob is None:
+                    yield None
+                    continue
+                vertices = array("f")
+                vertices.frombytes(blob[0])
+                indices = array("I")
+                indices.frombytes(blob[1])
+                yield vertices, indices
+    except Exception as e:
+        log("  Warning - Parallel tessellation unavailable ({}), using serial".format(e))
+    
+    for _ in range(len(shapes) - done):
+        yield None
+
+
+def convert(params, channel):
+    """
+    Convert one CAD file, streaming hierarchy records to channel
+    
+    Returns:
+        Number of objects sent
+    """
+    input_file = params["input_file"]
+    output_dir = params["output_dir"]
+    scale_factor = params.get("scale", 1.0)
+    y_up = params.get("y_up", True)
+    tessellation_quality = params.get("tessellation_quality", 0.1)
+    tessellation_workers = int(params.get("tessellation_workers", 1))
+    if tessellation_workers <= 0:
+        tessellation_workers = os.cpu_count() or 1
+    extract_metadata = params.get("extract_metadata", False)
+    use_msgpack = msgpack is not None and params.get("msgpack", False)
+    
+    log("=" * 60)
+    log("FREECAD CONVERSION SCRIPT")
+    log("=" * 60)
+    log("Archivo: " + input_file)
+    log("Iniciando a las " + time.strftime("%H:%M:%S"))
+    log("=" * 60)
+
+    log("\n[PASO 1/4] Creando documento FreeCAD...")
+    t_start = time.time()
+    doc = FreeCAD.newDocument(DOC_NAME)
+    mesh_files = []
+    try:
+        log("  OK - Documento creado en {:.2f}s".format(time.time()-t_start))
+        
+        # Import STEP or IGES
+        log("\n[PASO 2/4] Importando archivo CAD...")
+        log("  Esto puede tomar varios minutos...")
+        # Show the step before the long import blocks the buffer
+        flush_log()
+        file_ext = os.path.splitext(input_file)[1].lower()
+        t_import = time.time()
+        
+        # STEP and IGES both go through the same importer
+        if file_ext not in CAD_EXTENSIONS:
+            raise ValueError("Unsupported file format: " + file_ext)
+        Import.insert(input_file, DOC_NAME)
+        
+        import_time = time.time() - t_import
+        log("  OK - Archivo importado in {:.2f}s".format(import_time))
+        
+        # doc.Objects builds a new list on every access
+        all_objects = doc.Objects
+        total_objects = len(all_objects)
+        log("  Objetos cargados: {}".format(total_objects))
+        
+        # Process objects
+        log("\n[PASO 3/4] Procesando {} objetos...".format(total_objects))
+        t_process = time.time()
+        
+        # Objects are streamed to the bridge as they are processed
+        send_record(channel, {
+            "scale": scale_factor,
+            "y_up": y_up,
+            "mesh_buffers": {
+                "vertices": MESH_VERTICES_FILE,
+                "triangles": MESH_TRIANGLES_FILE
+            },
+            "transforms": TRANSFORMS_FILE
+        }, use_msgpack)
+        
+        def write_object(obj_data):
+            send_record(channel, obj_data, use_msgpack)
+        
+        # All meshes are packed into two flat buffers instead of one file per
+        # object; each mesh is appended as soon as it is tessellated, so disk
+        # writes overlap meshing and the geometry is never held in memory
+        mesh_vertices = open(os.path.join(output_dir, MESH_VERTICES_FILE), "wb", buffering=MESH_WRITE_BUFFER)
+        mesh_triangles = open(os.path.join(output_dir, MESH_TRIANGLES_FILE), "wb", buffering=MESH_WRITE_BUFFER)
+        mesh_files.extend((mesh_vertices, mesh_triangles))
+        mesh_counts = [0, 0]  # vertices, triangles written so far
+        
+        # Placements and bounding boxes, one TRANSFORM_STRIDE row per object slot
+        transforms = array("f")
+        
+        def pack_mesh(obj_data, label, vertices, indices):
+            if indices:
+                vertex_count = len(vertices) // 3
+                triangle_count = len(indices) // 3
+                obj_data["mesh_ref"] = [
+                    mesh_counts[0], vertex_count,
+                    mesh_counts[1], triangle_count
+                ]
+                vertices.tofile(mesh_vertices)
+                indices.tofile(mesh_triangles)
+                mesh_counts[0] += vertex_count
+                mesh_counts[1] += triangle_count
+                log("  Exported: {} (leaf object)".format(label))
+        
+        # Parents from Group property (used by App::Part), resolved up front
+        # so every object line can be written as soon as it is built; the
+        # same pass records which objects are groups (non-leaves)
+        group_parent = {}
+        group_names = set()
+        for obj in all_objects:
+            group = getattr(obj, "Group", None)
+            if group:
+                group_names.add(obj.Name)
+                for child in group:
+                    group_parent.setdefault(child.Name, obj.Name)
+        
+        root_objects = []
+        object_count = 0
+        
+        # Leaves waiting for the tessellation pool: (obj_data, label, shape)
+        mesh_jobs = []
+        parallel = tessellation_workers > 1
+        
+        # Skip datum/reference objects completely, partitioned once up front;
+        # the label and type read here are carried into the main loop
+        candidates = []
+        for idx, obj in enumerate(all_objects):
+            type_id = obj.TypeId
+            if type_id in DATUM_TYPES:
+                continue
+            label = obj.Label
+            if not is_datum_label(label):
+                candidates.append((idx, obj, label, type_id))
+        
+        # Loop-invariant lookups hoisted out of the per-object loop
+        root_append = root_objects.append
+        job_append = mesh_jobs.append
+        transforms_extend = transforms.extend
+        group_parent_get = group_parent.get
+        
+        for idx, obj, label, type_id in candidates:
+            # Every obj.X crosses into FreeCAD's C++ bindings; read each once
+            name = obj.Name
+            shape = getattr(obj, "Shape", None)
+            
+            if idx % 10 == 0 and idx > 0:
+                emit("PROGRESS", "{} {}".format(idx, total_objects))
+            
+            metadata = {}
+            obj_data = {
+                "name": label,
+                "internal_name": name,
+                "type": type_id,
+                "index": idx,
+                "slot": object_count,
+                "metadata": metadata,
+                "parent": None
+            }
+            object_count += 1
+            
+            # Extract geometric metadata only on request: OCCT integrates
+            # over the whole shape for Volume/Area/BoundBox
+            if extract_metadata and shape is not None:
+                if shape.Solids:
+                    metadata["volume"] = shape.Volume
+                metadata["area"] = getattr(shape, "Area", 0)
+                
+                try:
+                    bbox = shape.BoundBox
+                    bounds = (bbox.XMin, bbox.YMin, bbox.ZMin, bbox.XMax, bbox.YMax, bbox.ZMax)
+                except:
+                    bounds = (NAN,) * 6
+            else:
+                bounds = (NAN,) * 6
+            
+            # Extract color/material information
+            vobj = getattr(obj, "ViewObject", None)
+            if vobj:
+                # Try to get shape color (STEP files often have colors)
+                color = getattr(vobj, "ShapeColor", None)
+                if color is not None:
+                    # FreeCAD colors are tuples (r, g, b) in 0-1 range
+                    metadata["color"] = [color[0], color[1], color[2], 1.0]
+                
+                # Try to get diffuse color
+                else:
+                    # DiffuseColor is per-face, take first color
+                    diffuse = getattr(vobj, "DiffuseColor", None)
+                    if diffuse:
+                        color = diffuse[0]
+                        metadata["color"] = [color[0], color[1], color[2], color[3]]
+            
+            # Extract standard CAD properties
+            description = getattr(obj, "Description", None)
+            if description is not None:
+                metadata["description"] = description
+            material = getattr(obj, "Material", None)
+            if isinstance(material, str):
+                metadata["material_name"] = material
+            
+            # Position, rotation and bounds go to the transforms side-car
+            placement = getattr(obj, "Placement", None)
+            if placement is not None:
+                pos = placement.Base
+                qx, qy, qz, qw = placement.Rotation.Q
+                transforms_extend((pos.x, pos.y, pos.z, qx, qy, qz, qw))
+            else:
+                transforms_extend((NAN,) * 7)
+            transforms_extend(bounds)
+            
+            # Get parent relationship from the Group index built up front;
+            # Parents walks the document graph, so it is only consulted for
+            # objects no group claims
+            parent_name = group_parent_get(name)
+            if parent_name is None:
+                parents = getattr(obj, "Parents", None)
+                if parents:
+                    parent_name = parents[0][0].Name
+            obj_data["parent"] = parent_name
+            if not parent_name:
+                root_append(name)
+            
+            # Determine if this is a leaf object (actual geometry) or container
+            is_leaf = name not in group_names
+            obj_data["is_leaf"] = is_leaf
+            
+            # Mesh ONLY leaf objects with actual geometry
+            obj_data["mesh_ref"] = None
+            if is_leaf and shape is not None and shape.Faces:
+                if parallel:
+                    # Written once the pool has meshed it
+                    job_append((obj_data, label, shape))
+                    continue
+                try:
+                    vertices, indices = tessellate_shape(shape, tessellation_quality)
+                    pack_mesh(obj_data, label, vertices, indices)
+                except Exception as e:
+                    log("  Warning - Failed to export {}: {}".format(label, str(e)))
+            elif not is_leaf:
+                log("  Container: {}".format(label))
+            
+            write_object(obj_data)
+        
+        # Tessellate the queued leaves in the pool
+        if mesh_jobs:
+            meshes = None
+            if len(mesh_jobs) > 1:
+                log("  Teselando {} objetos con {} procesos...".format(len(mesh_jobs), tessellation_workers))
+                meshes = tessellate_parallel([job[2] for job in mesh_jobs], tessellation_quality, tessellation_workers)
+            
+            # Each leaf is packed and sent as soon as its mesh is back
+            for obj_data, label, shape in mesh_jobs:
+                try:
+                    mesh = next(meshes) if meshes is not None else None
+                    if mesh is None:
+                        mesh = tessellate_shape(shape, tessellation_quality)
+                    pack_mesh(obj_data, label, mesh[0], mesh[1])
+                except Exception as e:
+                    log("  Warning - Failed to export {}: {}".format(label, str(e)))
+                write_object(obj_data)
+            mesh_jobs = None
+        
+        send_record(channel, {"__root__": root_objects}, use_msgpack)
+        
+        process_time = time.time() - t_process
+        log("  OK - Procesamiento completado in {:.2f}s".format(process_time))
+        
+        # Save hierarchy data (mesh buffers only need flushing)
+        log("\n[PASO 4/4] Guardando datos...")
+        t_save = time.time()
+        mesh_vertices.close()
+        mesh_triangles.close()
+        with open(os.path.join(output_dir, TRANSFORMS_FILE), "wb") as f:
+            transforms.tofile(f)
+        save_time = time.time() - t_save
+        log("  OK - Guardado en {:.2f}s".format(save_time))
+        
+        total_time = time.time() - t_start
+        log("\n" + "=" * 60)
+        log("CONVERSION EXITOSA")
+        log("Tiempo total: {:.2f}s".format(total_time))
+        log("  - Importacion STEP: {:.2f}s".format(import_time))
+        log("  - Procesamiento: {:.2f}s".format(process_time))
+        log("  - Guardado: {:.2f}s".format(save_time))
+        log("Objetos procesados: {}".format(object_count))
+        log("=" * 60)
+        
+        return object_count
+    finally:
+        # Job dirs are reused; never leave a buffer open after a failure
+        for f in mesh_files:
+            f.close()
+        FreeCAD.closeDocument(DOC_NAME)
+
+
+def main():
+    """Serve conversion jobs from stdin until the bridge closes the pipe"""
+    channel = open_data_channel()
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        if not line.strip():
+            continue
+        
+        error = None
+        try:
+            convert(json.loads(line), channel)
+        except Exception as e:
+            log("ERROR: " + str(e))
+            flush_log()
+            traceback.print_exc()
+            error = " ".join(str(e).split())
+        finally:
+            # End this job's records before replying, even after a failure
+            channel.write(FRAME_HEADER.pack(0, b"E"))
+            channel.flush()
+        
+        if error is None:
+            emit("DONE")
+        else:
+            emit("ERROR", error)
+
+
+if __name__ == "__main__":
+    main()
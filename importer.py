@@ -6,7 +6,10 @@ Preserves hierarchy, metadata, and pivots
 
 import bpy
 import os
-import tempfile
+import numpy as np
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from . import freecad_bridge
 from . import utils
 
@@ -20,8 +23,17 @@ class CADImporter:
     def __init__(self, context):
         self.context = context
         self.imported_objects = []
-        self.object_map = {}  # Maps internal names to Blender objects
+        self.object_map = {}  # Maps internal names to Blender objects (only objects that exist)
         self.collection_map = {}  # Maps names to collections
+        self.mesh_vertices = None  # Shared (N, 3) vertex buffer from FreeCAD
+        self.mesh_triangles = None  # Shared (M, 3) triangle buffer from FreeCAD
+        self.transforms = None  # Per-object placement/bbox rows from FreeCAD
+        self._inv_cache = {}  # Parent pointer -> inverted world matrix
+        self._pending_parents = []  # (object, parent internal name), EMPTY mode
+        self._prepared_meshes = {}  # Internal name -> Future of _prepare_mesh
+        self._name_cache = {}  # Raw CAD label -> sanitized Blender name
+        self._async_job = None  # (bridge, output_dir) between start_import and finish_import
+        self._mesh_cache = defaultdict(list)  # (geometry hash, color) -> _MeshEntry list
         
     def import_file(self, filepath, options):
         """
@@ -39,11 +51,66 @@ class CADImporter:
         Returns:
             (success, message, imported_objects)
         """
+        bridge, error = self._get_bridge()
+        if error:
+            return False, error, []
+        
+        # Reuse a job directory from the bridge's slot pool
+        output_dir = bridge.allocate_job_dir()
+        print(f"ApexCad: Output directory: {output_dir}")
+        try:
+            return self._convert_and_import(bridge, filepath, output_dir, options)
+        finally:
+            bridge.release_job_dir(output_dir)
+    
+    def start_import(self, filepath, options):
+        """
+        Start the FreeCAD conversion on a background thread
+        Blender stays responsive; poll the task's done() and then call
+        finish_import() on the main thread.
+        
+        Returns:
+            (ConversionTask, error message or None)
+        """
+        bridge, error = self._get_bridge()
+        if error:
+            return None, error
+        
+        output_dir = bridge.allocate_job_dir()
+        print(f"ApexCad: Output directory: {output_dir}")
+        try:
+            conversion_options = self._conversion_options(filepath, options)
+            print("ApexCad: Starting FreeCAD conversion in the background...")
+            task = bridge.convert_file_async(filepath, output_dir, conversion_options)
+        except Exception:
+            bridge.release_job_dir(output_dir)
+            raise
+        self._async_job = (bridge, output_dir)
+        return task, None
+    
+    def finish_import(self, task, filepath, options):
+        """
+        Build the Blender scene from a finished start_import() task
+        
+        Returns:
+            (success, message, imported_objects)
+        """
+        bridge, output_dir = self._async_job
+        self._async_job = None
+        try:
+            if task.future.cancelled():
+                return False, "Import cancelled", []
+            return self._import_result(task.result(), filepath, output_dir, options)
+        finally:
+            bridge.release_job_dir(output_dir)
+    
+    def _get_bridge(self):
+        """Shared FreeCAD bridge, validated; returns (bridge, error)"""
         # Get FreeCAD bridge
         bridge, error = freecad_bridge.get_bridge(self.context)
         if error:
             print(f"ApexCad: Bridge error - {error}")
-            return False, error, []
+            return None, error
         
         # Validate FreeCAD before starting
         print("ApexCad: Validating FreeCAD installation...")
@@ -51,28 +118,53 @@ class CADImporter:
         if not is_valid:
             error_msg = f"FreeCAD validation failed: {validation_msg}"
             print(f"ApexCad: {error_msg}")
-            return False, error_msg, []
+            return None, error_msg
         
         print(f"ApexCad: FreeCAD validation OK - {validation_msg}")
-        
-        # Create temporary output directory
-        output_dir = tempfile.mkdtemp(prefix="apexcad_import_")
-        print(f"ApexCad: Output directory: {output_dir}")
-        
-        # Prepare conversion options
+        return bridge, None
+    
+    def _conversion_options(self, filepath, options):
+        """Options sent to the FreeCAD worker"""
+        prefs = self.context.preferences.addons[__package__.split('.')[0]].preferences
         conversion_options = {
             'scale': options.get('scale', 1.0),
             'y_up': options.get('y_up', True),
             'tessellation_quality': options.get('tessellation_quality', 0.1),
+            'tessellation_workers': prefs.tessellation_workers,
+            'extract_metadata': options.get('extract_metadata', False),
+            'verbose': prefs.verbose_console,
         }
         
         print(f"ApexCad: Starting import of {os.path.basename(filepath)}")
         print(f"ApexCad: Options: {conversion_options}")
+        return conversion_options
+    
+    def _convert_and_import(self, bridge, filepath, output_dir, options):
+        """Run the FreeCAD conversion into output_dir and import the result"""
+        conversion_options = self._conversion_options(filepath, options)
         
         # Convert file using FreeCAD
         print("ApexCad: Starting FreeCAD conversion (this may take a while)...")
-        result = bridge.convert_file_sync(filepath, output_dir, conversion_options)
+        wm = self.context.window_manager
+        
+        def _on_progress(done, total):
+            wm.progress_update(int(done * 100 / max(total, 1)))
+        
+        wm.progress_begin(0, 100)
+        try:
+            result = bridge.convert_file_sync(
+                filepath,
+                output_dir,
+                conversion_options,
+                progress_callback=_on_progress
+            )
+        finally:
+            wm.progress_end()
         
+        return self._import_result(result, filepath, output_dir, options)
+    
+    def _import_result(self, result, filepath, output_dir, options):
+        """Import a convert_file_sync result into Blender"""
         if not result['success']:
             error_msg = result.get('error', 'Unknown error')
             print(f"ApexCad: Conversion failed - {error_msg}")
@@ -80,17 +172,13 @@ class CADImporter:
         
         print("ApexCad: FreeCAD conversion completed successfully")
         
-        if not result['success']:
-            return False, result.get('error', 'Unknown error'), []
-        
         # Import into Blender
+        prefs = self.context.preferences.addons[__package__.split('.')[0]].preferences
         hierarchy = result['hierarchy']
         options['filepath'] = filepath  # Store for source file reference
+        options['verbose'] = prefs.verbose_console
         success, message = self._import_hierarchy(hierarchy, options, output_dir)
         
-        # Cleanup
-        bridge.cleanup()
-        
         if success:
             return True, f"Successfully imported {len(self.imported_objects)} objects", self.imported_objects
         else:
@@ -114,6 +202,17 @@ class CADImporter:
         
         print(f"ApexCad: Importing {len(objects_data)} objects...")
         
+        # Load all mesh data once; objects slice into these arrays
+        self.mesh_vertices, self.mesh_triangles = utils.load_mesh_buffers(
+            output_dir, hierarchy['mesh_buffers']
+        )
+        self.transforms = utils.load_transform_buffer(output_dir, hierarchy['transforms'])
+        
+        # Y-up conversion runs once over the shared buffer, before any mesh
+        # exists; instances then share already-converted data
+        if y_up:
+            utils.convert_vertices_y_up(self.mesh_vertices)
+        
         # Create main collection/empty for the import
         file_name = os.path.splitext(os.path.basename(options.get('filepath', 'Import')))[0]
         file_name = utils.sanitize_name(file_name)
@@ -128,50 +227,79 @@ class CADImporter:
             # Create root Empty for hierarchy
             root_parent = utils.create_empty(file_name, collection=main_collection)
         
-        self.object_map[file_name] = root_parent
-        
-        # Build object map first (for parent references)
-        for obj_data in objects_data:
-            internal_name = obj_data['internal_name']
-            self.object_map[internal_name] = None  # Placeholder
+        if root_parent is not None:
+            self.object_map[file_name] = root_parent
         
         # Process objects in chunks (divide and conquer)
         total_objects = len(objects_data)
-        chunks = [objects_data[i:i+chunk_size] for i in range(0, total_objects, chunk_size)]
-        
-        print(f"ApexCad: Processing in {len(chunks)} chunks of max {chunk_size} objects")
-        
-        for chunk_idx, chunk in enumerate(chunks):
-            print(f"ApexCad: Processing chunk {chunk_idx+1}/{len(chunks)}")
+        total_chunks = (total_objects + chunk_size - 1) // chunk_size
+        
+        print(f"ApexCad: Processing in {total_chunks} chunks of max {chunk_size} objects")
+        
+        # Mesh arrays are scaled, converted and hashed on worker threads (no
+        # bpy access there) while this thread creates the Blender objects
+        workers = min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="apexcad-mesh") as executor:
+            for obj_data in objects_data:
+                slices = self._mesh_slices(obj_data.get('mesh_ref'))
+                if slices is not None:
+                    self._prepared_meshes[obj_data['internal_name']] = executor.submit(_prepare_mesh, *slices, scale)
             
-            for obj_data in chunk:
-                self._import_object(obj_data, hierarchy_mode, main_collection, root_parent, output_dir, scale, y_up, options)
+            try:
+                # Chunks are consecutive slices of one iterator; no list of
+                # sublists is built
+                remaining = iter(objects_data)
+                import_object = self._import_object
+                verbose = options.get('verbose', False)
+                for chunk_idx in range(total_chunks):
+                    if verbose:
+                        print(f"ApexCad: Processing chunk {chunk_idx+1}/{total_chunks}")
+                    
+                    for obj_data in islice(remaining, chunk_size):
+                        import_object(obj_data, hierarchy_mode, main_collection, root_parent, options)
+            finally:
+                for future in self._prepared_meshes.values():
+                    future.cancel()
+                self._prepared_meshes.clear()
+        
+        # Apply smooth shading with auto smooth, one operator call for all meshes
+        utils.apply_smooth_shading(self.imported_objects, auto_smooth_angle=30)
         
         # Setup parent-child relationships
         print("ApexCad: Building hierarchy...")
         print(f"ApexCad: object_map contains {len(self.object_map)} entries")
         
-        # Debug: show assemblies in map
-        assemblies = {k: v for k, v in self.object_map.items() if v and v.type == 'EMPTY'}
-        if assemblies:
-            print(f"ApexCad: Found {len(assemblies)} assemblies:")
-            for internal_name, obj in list(assemblies.items())[:5]:
-                print(f"  - '{internal_name}' → {obj.name}")
-            if len(assemblies) > 5:
-                print(f"  ... and {len(assemblies) - 5} more")
-        
-        for obj_data in objects_data:
-            self._setup_parent_child(obj_data, hierarchy_mode)
+        # Debug: show assemblies in map (walks the whole map, verbose only)
+        if options.get('verbose', False):
+            assemblies = [(k, v) for k, v in self.object_map.items() if v and v.type == 'EMPTY']
+            if assemblies:
+                print(f"ApexCad: Found {len(assemblies)} assemblies:")
+                for internal_name, obj in assemblies[:5]:
+                    print(f"  - '{internal_name}' → {obj.name}")
+                if len(assemblies) > 5:
+                    print(f"  ... and {len(assemblies) - 5} more")
+        
+        # Parents queued while objects were created (COLLECTION mode has none)
+        if self._pending_parents:
+            # One depsgraph evaluation for the whole import, so the parents'
+            # matrix_world read by _inv_world reflects their locations; no
+            # updates happen inside the per-object loops
+            self.context.view_layer.update()
+        self._apply_pending_parents(options.get('verbose', False))
         
         # Reconstruct nested hierarchy from naming patterns (EMPTY mode only)
         # STEP files imported by FreeCAD lose nested hierarchy
         # We reconstruct it by matching name prefixes
         if hierarchy_mode == 'EMPTY':
             print("ApexCad: Reconstructing nested hierarchy from names...")
-            self._reconstruct_hierarchy()
+            self._reconstruct_hierarchy(root_parent, options.get('verbose', False))
+        
+        # Parents may move once hierarchy building is done
+        self._inv_cache.clear()
+        self._mesh_cache.clear()
         
         # Detect and create instances for optimization
-        self._detect_and_create_instances()
+        self._detect_and_create_instances(options.get('verbose', False))
         
         # Apply Y-up conversion if needed
         if y_up:
@@ -183,26 +311,23 @@ class CADImporter:
                 import math
                 root_parent.rotation_euler = (math.radians(-180), 0, 0)
                 print(f"  ↻ Root rotation: X=-180°")
-            
-            # Apply mesh conversion
-            for obj in self.imported_objects:
-                if obj and obj.type == 'MESH':
-                    utils.apply_y_up_conversion(obj)
         
         return True, "Import successful"
     
-    def _import_object(self, obj_data, hierarchy_mode, main_collection, root_parent, output_dir, scale, y_up, options):
+    def _import_object(self, obj_data, hierarchy_mode, main_collection, root_parent, options):
         """Import a single object"""
         internal_name = obj_data['internal_name']
-        obj_name = utils.sanitize_name(obj_data['name'])
-        mesh_file = obj_data.get('mesh_file')
+        obj_name = self._sanitized_name(obj_data['name'])
+        mesh_ref = obj_data.get('mesh_ref')
         metadata = obj_data.get('metadata', {})
-        transform = obj_data.get('transform', {})
-        obj_type = obj_data.get('type', '')
+        if options.get('extract_metadata', False):
+            metadata = self._with_bounds(metadata, obj_data['slot'])
         is_leaf = obj_data.get('is_leaf', True)
+        # Per-object lines only with Verbose Console Output; failures always print
+        verbose = options.get('verbose', False)
         
         # Create Empties for assemblies (containers without geometry)
-        if not mesh_file:
+        if not mesh_ref:
             # For containers (assemblies), create an Empty or sub-collection
             if not is_leaf:
                 # Assemblies are at origin since children have world coordinates
@@ -211,8 +336,8 @@ class CADImporter:
                     sub_collection = utils.get_collection(self.context, obj_name, parent=main_collection)
                     self.collection_map[internal_name] = sub_collection
                     # No Empty needed - collections form the hierarchy
-                    self.object_map[internal_name] = None  # Marker for sub-collection
-                    print(f"  ○ Assembly (Collection): {obj_name}")
+                    if verbose:
+                        print(f"  ○ Assembly (Collection): {obj_name}")
                 else:
                     # EMPTY mode: create Empty for hierarchy
                     empty = utils.create_empty(
@@ -224,11 +349,12 @@ class CADImporter:
                     utils.set_custom_properties(empty, metadata)
                     self.object_map[internal_name] = empty
                     self.imported_objects.append(empty)
-                    print(f"  ○ Assembly (Empty): {obj_name}")
+                    self._queue_parent(empty, obj_data)
+                    if verbose:
+                        print(f"  ○ Assembly (Empty): {obj_name}")
             else:
                 # Leaf without geometry (shouldn't happen after datum filtering)
                 print(f"  ⊘ Skipped: {obj_name} (no geometry)")
-                self.object_map[internal_name] = None
             return
         
         # Get or create collection/parent for this object
@@ -246,37 +372,63 @@ class CADImporter:
             obj_parent = root_parent
         
         # Import mesh if available
-        if os.path.exists(mesh_file):
-            # NOTE: The OBJ file from FreeCAD already has transformations baked in
-            # (exported from obj.Shape which is in world space)
-            # So we import at origin and don't apply transforms
+        prepared = self._prepared_meshes.pop(internal_name, None)
+        if prepared is not None:
+            # NOTE: Mesh data from FreeCAD already has transformations baked in
+            # (tessellated from obj.Shape which is in world space)
+            # So we create the object at origin and don't apply transforms
             
-            # Import OBJ file with scale applied to geometry only
-            imported_obj = utils.import_obj_file(
-                mesh_file,
-                obj_name,
-                location=[0, 0, 0],  # OBJ already in world space
-                rotation_quat=None,   # No additional rotation
-                parent=obj_parent,
-                collection=obj_collection,
-                scale=scale  # Only apply scale to vertices
-            )
+            # Vertices arrive already scaled (scale applies to geometry only)
+            vertices, triangles, mesh_hash_value = prepared.result()
+            color = metadata.get('color')
+            cache_key = (mesh_hash_value, tuple(color) if color else None)
+            shared = self._find_shared_mesh(cache_key, vertices, triangles)
+            if shared is not None:
+                # Copy of an earlier part: reuse its mesh datablock (and the
+                # material on it), placed at the offset between the copies
+                entry, offset = shared
+                imported_obj = utils.create_object_from_mesh(
+                    obj_name,
+                    entry.mesh,
+                    location=offset,
+                    parent=obj_parent,
+                    collection=obj_collection
+                )
+            else:
+                imported_obj = utils.create_mesh_object(
+                    obj_name,
+                    vertices,
+                    triangles,
+                    location=[0, 0, 0],  # Mesh already in world space
+                    rotation_quat=None,   # No additional rotation
+                    parent=obj_parent,
+                    collection=obj_collection
+                )
+                if imported_obj:
+                    self._mesh_cache[cache_key].append(
+                        _MeshEntry(imported_obj.data, imported_obj.name, vertices.min(axis=0))
+                    )
             
             if imported_obj:
                 # Store metadata as custom properties
                 utils.set_custom_properties(imported_obj, metadata)
                 
-                # Store original tessellation quality for re-tessellation
-                imported_obj['apexcad_original_file'] = obj_data.get('internal_name', '')
-                imported_obj['apexcad_source_file'] = options.get('filepath', '')
-                imported_obj['apexcad_tessellation'] = options.get('tessellation_quality', 0.01)
+                # Store original tessellation quality for re-tessellation,
+                # together with the instance-detection data
+                utils.set_properties(imported_obj, {
+                    'apexcad_original_file': obj_data.get('internal_name', ''),
+                    'apexcad_source_file': options.get('filepath', ''),
+                    'apexcad_tessellation': options.get('tessellation_quality', 0.01),
+                    'apexcad_mesh_hash': mesh_hash_value,
+                    'apexcad_can_retessellate': True,
+                })
                 
-                # Apply smooth shading with auto smooth
-                utils.apply_smooth_shading(imported_obj, auto_smooth_angle=30)
+                if shared is not None:
+                    imported_obj['apexcad_instance_of'] = shared[0].object_name
                 
                 # Create and assign material if color information exists
-                if 'color' in metadata:
-                    color = metadata['color']
+                # (a shared mesh already carries a material of this color)
+                if color is not None and shared is None:
                     mat_name = f"CAD_{obj_name}"
                     material = utils.create_material_from_color(mat_name, color)
                     
@@ -286,21 +438,21 @@ class CADImporter:
                     else:
                         imported_obj.data.materials.append(material)
                 
-                # Store mesh hash for instance detection
-                mesh_hash_value = utils.mesh_hash(imported_obj.data)
-                imported_obj['apexcad_mesh_hash'] = mesh_hash_value
-                imported_obj['apexcad_can_retessellate'] = True
-                
                 self.object_map[internal_name] = imported_obj
                 self.imported_objects.append(imported_obj)
+                if hierarchy_mode == 'EMPTY':
+                    self._queue_parent(imported_obj, obj_data)
                 
-                print(f"  ✓ Imported: {obj_name}")
+                if verbose:
+                    print(f"  ✓ Imported: {obj_name}")
             else:
                 print(f"  ✗ Failed to import: {obj_name}")
         else:
             # Create empty placeholder for objects without geometry
             if hierarchy_mode == 'EMPTY':
-                location = transform.get('position', [0, 0, 0])
+                location = self.transforms[obj_data['slot'], 0:3]
+                if np.isnan(location).any():
+                    location = (0, 0, 0)
                 empty = utils.create_empty(
                     obj_name,
                     location=location,
@@ -310,39 +462,103 @@ class CADImporter:
                 utils.set_custom_properties(empty, metadata)
                 self.object_map[internal_name] = empty
                 self.imported_objects.append(empty)
-                print(f"  ○ Created empty: {obj_name}")
+                self._queue_parent(empty, obj_data)
+                if verbose:
+                    print(f"  ○ Created empty: {obj_name}")
     
-    def _setup_parent_child(self, obj_data, hierarchy_mode='EMPTY'):
-        """Setup parent-child relationships after all objects are created"""
-        # In COLLECTION mode, collections handle hierarchy - skip object parenting
-        if hierarchy_mode == 'COLLECTION':
-            return
-            
-        internal_name = obj_data['internal_name']
-        parent_name = obj_data.get('parent')
-        
-        if not parent_name:
-            return
+    def _with_bounds(self, metadata, slot):
+        """Metadata plus the bbox_min/bbox_max read from the transforms side-car"""
+        bounds = self.transforms[slot, 7:13]
+        if np.isnan(bounds).any():
+            return metadata
+        return dict(metadata, bbox_min=bounds[:3].tolist(), bbox_max=bounds[3:].tolist())
+    
+    def _sanitized_name(self, raw_name):
+        """sanitize_name, computed once per distinct CAD label"""
+        name = self._name_cache.get(raw_name)
+        if name is None:
+            name = utils.sanitize_name(raw_name)
+            self._name_cache[raw_name] = name
+        return name
+    
+    def _find_shared_mesh(self, cache_key, vertices, triangles):
+        """
+        Find an already created mesh this geometry is a translated copy of
         
-        child_obj = self.object_map.get(internal_name)
-        parent_obj = self.object_map.get(parent_name)
+        The geometry hash only groups candidates; the arrays are compared
+        in full before a mesh is shared. A candidate's arrays are read
+        back from its mesh on the first hit, so unique parts keep no copy.
         
-        if not child_obj:
-            # Object was skipped (reference plane, etc.)
-            return
+        Returns:
+            (_MeshEntry, offset) or None
+        """
+        entries = self._mesh_cache.get(cache_key)
+        if not entries:
+            return None
+        vertices_min = vertices.min(axis=0)
+        for entry in entries:
+            entry_vertices, entry_triangles = entry.arrays()
+            if entry_vertices.shape != vertices.shape or not np.array_equal(entry_triangles, triangles):
+                continue
+            offset = vertices_min - entry.vertices_min
+            if np.allclose(vertices - offset, entry_vertices, rtol=0, atol=_SHARE_TOLERANCE):
+                return entry, offset
+        return None
+    
+    def _inv_world(self, obj):
+        """
+        Inverted world matrix of a parent, computed once per object
+        Parenting with this inverse keeps the child's world transform, so a
+        parent's matrix_world doesn't change while the hierarchy is built.
+        """
+        key = obj.as_pointer()
+        inverse = self._inv_cache.get(key)
+        if inverse is None:
+            inverse = obj.matrix_world.inverted()
+            self._inv_cache[key] = inverse
+        return inverse
+    
+    def _mesh_slices(self, mesh_ref):
+        """Views of an object's vertices and triangles in the shared buffers, or None"""
+        if not mesh_ref:
+            return None
+        first_vertex, vertex_count, first_triangle, triangle_count = mesh_ref
+        # A truncated buffer must not yield a short slice
+        if first_vertex + vertex_count > len(self.mesh_vertices):
+            return None
+        if first_triangle + triangle_count > len(self.mesh_triangles):
+            return None
+        return (
+            self.mesh_vertices[first_vertex:first_vertex + vertex_count],
+            self.mesh_triangles[first_triangle:first_triangle + triangle_count],
+        )
+    
+    def _queue_parent(self, obj, obj_data):
+        """Remember an object's parent to link once all objects exist"""
+        parent_name = obj_data.get('parent')
+        if parent_name:
+            self._pending_parents.append((obj, parent_name))
+    
+    def _apply_pending_parents(self, verbose=False):
+        """Setup parent-child relationships after all objects are created"""
+        object_map_get = self.object_map.get
+        inv_world = self._inv_world
+        for child_obj, parent_name in self._pending_parents:
+            parent_obj = object_map_get(parent_name)
+            
+            if not parent_obj:
+                print(f"  ⚠ Parent not found: {parent_name} (for {child_obj.name})")
+                continue
             
-        if not parent_obj:
-            print(f"  ⚠ Parent not found: {parent_name} (for {child_obj.name})")
-            return
-        
-        if child_obj and parent_obj and child_obj != parent_obj:
             # Solo parentear si no está ya parenteado
-            if not child_obj.parent or child_obj.parent != parent_obj:
+            if child_obj != parent_obj and child_obj.parent != parent_obj:
                 child_obj.parent = parent_obj
-                child_obj.matrix_parent_inverse = parent_obj.matrix_world.inverted()
-                print(f"  ↳ Parented: {child_obj.name} → {parent_obj.name}")
+                child_obj.matrix_parent_inverse = inv_world(parent_obj)
+                if verbose:
+                    print(f"  ↳ Parented: {child_obj.name} → {parent_obj.name}")
+        self._pending_parents.clear()
 
-    def _reconstruct_hierarchy(self):
+    def _reconstruct_hierarchy(self, root_parent=None, verbose=False):
         """Reconstruct nested hierarchy from name patterns
         
         STEP files imported by FreeCAD lose assembly Group relationships.
@@ -355,73 +571,68 @@ class CADImporter:
         for internal_name, obj in self.object_map.items():
             if obj and obj.type == 'EMPTY':
                 # Remove .001 suffix to get clean name
-                clean_name = obj.name.rsplit('.', 1)[0] if '.' in obj.name else obj.name
-                assemblies[clean_name] = (internal_name, obj)
+                assemblies[_strip_name_suffix(obj.name)] = (internal_name, obj)
         
         if not assemblies:
             print("ApexCad: No assemblies found for hierarchy reconstruction")
             return
         
-        print(f"ApexCad: Found {len(assemblies)} assemblies for matching:")
-        for name in list(assemblies.keys())[:5]:
-            print(f"  - {name}")
+        print(f"ApexCad: Found {len(assemblies)} assemblies for matching")
+        if verbose:
+            for name in list(assemblies.keys())[:5]:
+                print(f"  - {name}")
+        
+        # Objects to match (assemblies themselves are skipped)
+        candidates = [obj for obj in self.object_map.values() if obj and obj.type != 'EMPTY']
+        if not candidates:
+            print("ApexCad: No reparenting needed")
+            return
+        
+        # FreeCAD kept the Group relationships: nothing to reconstruct
+        nested = sum(1 for obj in candidates if obj.parent is not None and obj.parent != root_parent)
+        if nested > _RECONSTRUCT_SKIP_RATIO * len(candidates):
+            print(f"ApexCad: Hierarchy already complete ({nested}/{len(candidates)} parented), skipping reconstruction")
+            return
+        
+        asm_names = list(assemblies.keys())
+        asm_objs = [asm_obj for _, asm_obj in assemblies.values()]
+        obj_names = [_strip_name_suffix(obj.name) for obj in candidates]
+        
+        # Tokens (split on hyphens, CAD naming convention) become integer codes
+        # so every object/assembly pair is scored in one NumPy pass
+        vocab = {}
+        asm_codes = _encode_name_tokens(asm_names, vocab)
+        obj_codes = _encode_name_tokens(obj_names, vocab)
+        
+        best_idx = np.empty(len(candidates), dtype=np.int64)
+        best_score = np.empty(len(candidates), dtype=np.int64)
+        # Bound the (objects, assemblies, tokens) temporaries
+        block = max(1, _MATCH_BLOCK_CELLS // (len(asm_names) * max(asm_codes[0].shape[1], obj_codes[0].shape[1])))
+        for start in range(0, len(candidates), block):
+            rows = slice(start, start + block)
+            score = _prefix_match_scores([codes[rows] for codes in obj_codes], asm_codes)
+            best_idx[rows] = score.argmax(axis=1)
+            best_score[rows] = score.max(axis=1)
         
         reparented = 0
-        # Check all objects
-        for internal_name, obj in self.object_map.items():
-            if not obj or obj.type == 'EMPTY':  # Skip assemblies themselves
-                continue
-            
-            # Get clean object name
-            obj_clean = obj.name.rsplit('.', 1)[0] if '.' in obj.name else obj.name
-            
-            # Find best matching assembly (longest prefix match)
-            best_match = None
-            best_score = 0
-            
-            for asm_name, (asm_internal, asm_obj) in assemblies.items():
-                # Skip if it's the same object
-                if asm_obj == obj:
-                    continue
-                
-                # Check if object name starts with assembly name prefix
-                # Use hyphen-separated matching for CAD naming conventions
-                parts_obj = obj_clean.upper().split('-')
-                parts_asm = asm_name.upper().split('-')
-                
-                # Calculate matching score
-                score = 0
-                for i in range(min(len(parts_obj), len(parts_asm))):
-                    if parts_obj[i] == parts_asm[i]:
-                        # Exact match worth 2 points
-                        score += 2
-                    elif parts_obj[i].startswith(parts_asm[i][:2]) or parts_asm[i].startswith(parts_obj[i][:2]):
-                        # Partial match (first 2 chars) worth 1 point
-                        score += 1
-                    else:
-                        # Stop on first non-match
-                        break
-                
-                # Require minimum score of 4 (e.g., 2 exact matches)
-                # and make sure assembly name is different from object name
-                if score >= 4 and obj_clean.upper() != asm_name.upper() and score > best_score:
-                    best_match = asm_obj
-                    best_score = score
-            
+        for row in np.flatnonzero(best_score >= 4):
+            obj = candidates[row]
+            best_match = asm_objs[best_idx[row]]
             # Reparent if we found a better match than current parent
-            if best_match and obj.parent != best_match:
-                old_parent = obj.parent.name if obj.parent else "None"
+            if best_match != obj and obj.parent != best_match:
+                if verbose:
+                    old_parent = obj.parent.name if obj.parent else "None"
+                    print(f"  ↻ {obj.name}: {old_parent} → {best_match.name}")
                 obj.parent = best_match
-                obj.matrix_parent_inverse = best_match.matrix_world.inverted()
+                obj.matrix_parent_inverse = self._inv_world(best_match)
                 reparented += 1
-                print(f"  ↻ {obj.name}: {old_parent} → {best_match.name}")
         
         if reparented > 0:
             print(f"ApexCad: Reconstructed {reparented} relationships")
         else:
             print("ApexCad: No reparenting needed")
     
-    def _detect_and_create_instances(self):
+    def _detect_and_create_instances(self, verbose=False):
         """
         Detect identical meshes and convert to instances for optimization
         
@@ -431,7 +642,7 @@ class CADImporter:
         print("ApexCad: Detecting identical meshes for instancing...")
         
         # Group objects by mesh hash
-        mesh_groups = {}
+        mesh_groups = defaultdict(list)
         
         for obj in self.imported_objects:
             if not obj or obj.type != 'MESH':
@@ -441,8 +652,6 @@ class CADImporter:
             if not mesh_hash:
                 continue
             
-            if mesh_hash not in mesh_groups:
-                mesh_groups[mesh_hash] = []
             mesh_groups[mesh_hash].append(obj)
         
         # Convert duplicates to instances
@@ -452,23 +661,37 @@ class CADImporter:
             if len(objects) < 2:
                 continue
             
-            # Use first object as reference
-            reference_obj = objects[0]
-            
-            # Verify meshes are actually identical (hash can have collisions)
-            identical_objects = [reference_obj]
-            
-            for obj in objects[1:]:
-                if utils.are_meshes_identical(reference_obj.data, obj.data):
-                    identical_objects.append(obj)
+            # Hash collisions between different topologies are split off by
+            # their counts before any vertex comparison
+            buckets = defaultdict(list)
+            for obj in objects:
+                buckets[(len(obj.data.vertices), len(obj.data.polygons))].append(obj)
             
-            # Convert to instances if we have duplicates
-            if len(identical_objects) >= 2:
-                print(f"  ⚡ Found {len(identical_objects)} instances of {reference_obj.name}")
+            for bucket in buckets.values():
+                if len(bucket) < 2:
+                    continue
+                
+                # Use first object as reference
+                reference_obj = bucket[0]
+                
+                # Verify meshes are actually identical (hash can have collisions)
+                identical_objects = [reference_obj]
                 
-                for obj in identical_objects[1:]:
-                    utils.convert_to_instance(obj, reference_obj)
-                    instances_created += 1
+                for obj in bucket[1:]:
+                    if obj.data == reference_obj.data:
+                        # Already shared when it was created
+                        continue
+                    if utils.are_meshes_identical(reference_obj.data, obj.data):
+                        identical_objects.append(obj)
+                
+                # Convert to instances if we have duplicates
+                if len(identical_objects) >= 2:
+                    if verbose:
+                        print(f"  ⚡ Found {len(identical_objects)} instances of {reference_obj.name}")
+                    
+                    for obj in identical_objects[1:]:
+                        utils.convert_to_instance(obj, reference_obj)
+                        instances_created += 1
         
         if instances_created > 0:
             print(f"ApexCad: Created {instances_created} instances")
@@ -479,7 +702,142 @@ class CADImporter:
 
 
 
-def import_cad_file(context, filepath, scale=1.0, hierarchy_mode='COLLECTION', y_up=True, chunk_size=50, tessellation_quality=0.1):
+def _prepare_mesh(vertices, triangles, scale):
+    """
+    Thread-side half of a mesh import: scale, convert and hash the arrays
+    Touches no bpy data, so it runs off the main thread.
+    
+    Returns:
+        (scaled float32 vertices, int32 triangles, geometry hash)
+    """
+    mesh_hash = utils.geometry_hash(vertices, triangles)
+    if scale != 1.0:
+        vertices = vertices * np.float32(scale)
+    return vertices, triangles.astype(np.int32), mesh_hash
+
+
+class _MeshEntry:
+    """A mesh created during one import, reusable by later copies of the part"""
+    
+    def __init__(self, mesh, object_name, vertices_min):
+        self.mesh = mesh
+        self.object_name = object_name
+        self.vertices_min = vertices_min
+        self._arrays = None
+    
+    def arrays(self):
+        """(vertices, triangles) of the mesh, read back once a copy is a candidate"""
+        if self._arrays is None:
+            self._arrays = utils.mesh_arrays(self.mesh)
+        return self._arrays
+
+
+# Max per-coordinate difference for parts to share a mesh (as are_meshes_identical)
+_SHARE_TOLERANCE = 1e-4
+
+# Share of parts already under an assembly above which reconstruction is skipped
+_RECONSTRUCT_SKIP_RATIO = 0.9
+
+# Max cells (objects x assemblies x tokens) scored at once by _reconstruct_hierarchy
+_MATCH_BLOCK_CELLS = 4_000_000
+
+
+def _strip_name_suffix(name):
+    """Drop Blender's .001 style suffix (reads the RNA name string once)"""
+    return name.rsplit('.', 1)[0]
+
+
+def _encode_name_tokens(names, vocab):
+    """
+    Encode hyphen-separated name tokens as integer code arrays
+    
+    Args:
+        names: Clean object/assembly names
+        vocab: Dict shared between the arrays being compared (string -> code)
+    
+    Returns:
+        Tuple of (N, K) int arrays (full token, 2-char prefix, 1-char prefix,
+        prefix length) plus the whole upper-cased name code (N,) and the
+        token count (N,); K is the largest token count
+    """
+    split = [name.upper().split('-') for name in names]
+    width = max(len(parts) for parts in split)
+    full = np.full((len(names), width), -1, dtype=np.int64)
+    prefix2 = np.full_like(full, -1)
+    prefix1 = np.full_like(full, -1)
+    prefix_len = np.zeros_like(full)
+    whole = np.empty(len(names), dtype=np.int64)
+    count = np.empty(len(names), dtype=np.int64)
+    
+    code = vocab.setdefault
+    for row, parts in enumerate(split):
+        count[row] = len(parts)
+        whole[row] = code('-'.join(parts), len(vocab))
+        for col, part in enumerate(parts):
+            full[row, col] = code(part, len(vocab))
+            prefix2[row, col] = code(part[:2], len(vocab))
+            prefix1[row, col] = code(part[:1], len(vocab))
+            prefix_len[row, col] = len(part[:2])
+    return full, prefix2, prefix1, prefix_len, whole, count
+
+
+def _starts_with_prefix(prefix1, prefix2, other_prefix2, other_len):
+    """Vectorized token.startswith(other_token[:2]) on encoded tokens"""
+    return np.where(
+        other_len == 2, prefix2 == other_prefix2,
+        np.where(other_len == 1, prefix1 == other_prefix2, True)
+    )
+
+
+def _prefix_match_scores(obj_codes, asm_codes):
+    """
+    Score every object against every assembly by leading token matches
+    
+    An exact token scores 2, a token sharing its first two characters scores
+    1, and counting stops at the first token that does neither. Pairs with
+    the same whole name score 0.
+    
+    Returns:
+        (objects, assemblies) int array of scores
+    """
+    o_full, o_p2, o_p1, o_len, o_whole, o_count = (a[:, None] for a in obj_codes)
+    a_full, a_p2, a_p1, a_len, a_whole, a_count = (a[None] for a in asm_codes)
+    
+    # Pad both sides to the same token width
+    width = max(o_full.shape[2], a_full.shape[2])
+    pad = lambda arr, fill: np.pad(arr, ((0, 0), (0, 0), (0, width - arr.shape[2])), constant_values=fill)
+    o_full, o_p2, o_p1, o_len = pad(o_full, -1), pad(o_p2, -1), pad(o_p1, -1), pad(o_len, 0)
+    a_full, a_p2, a_p1, a_len = pad(a_full, -1), pad(a_p2, -1), pad(a_p1, -1), pad(a_len, 0)
+    
+    exact = o_full == a_full
+    partial = (
+        _starts_with_prefix(o_p1, o_p2, a_p2, a_len)
+        | _starts_with_prefix(a_p1, a_p2, o_p2, o_len)
+    )
+    token_score = np.where(exact, 2, np.where(partial, 1, 0))
+    
+    # Only tokens present in both names count, up to the first miss
+    valid = np.arange(width) < np.minimum(o_count, a_count)[..., None]
+    run = np.cumprod((token_score > 0) & valid, axis=2)
+    score = (token_score * run).sum(axis=2)
+    score[o_whole == a_whole] = 0
+    return score
+
+
+def make_options(filepath, scale=1.0, hierarchy_mode='COLLECTION', y_up=True, chunk_size=50, tessellation_quality=0.1, extract_metadata=False):
+    """Import options dict for CADImporter (see import_cad_file for the arguments)"""
+    return {
+        'filepath': filepath,
+        'scale': scale,
+        'hierarchy_mode': hierarchy_mode,
+        'y_up': y_up,
+        'chunk_size': chunk_size,
+        'tessellation_quality': tessellation_quality,
+        'extract_metadata': extract_metadata,
+    }
+
+
+def import_cad_file(context, filepath, scale=1.0, hierarchy_mode='COLLECTION', y_up=True, chunk_size=50, tessellation_quality=0.1, extract_metadata=False):
     """
     Convenience function to import CAD file
     
@@ -491,19 +849,11 @@ def import_cad_file(context, filepath, scale=1.0, hierarchy_mode='COLLECTION', y
         y_up: Convert to Y-up
         chunk_size: Max objects per chunk
         tessellation_quality: Mesh quality (lower = better quality, slower)
+        extract_metadata: Compute volume, area and bounding box per part
     
     Returns:
         (success, message, imported_objects)
     """
     importer = CADImporter(context)
-    
-    options = {
-        'filepath': filepath,
-        'scale': scale,
-        'hierarchy_mode': hierarchy_mode,
-        'y_up': y_up,
-        'chunk_size': chunk_size,
-        'tessellation_quality': tessellation_quality,
-    }
-    
+    options = make_options(filepath, scale, hierarchy_mode, y_up, chunk_size, tessellation_quality, extract_metadata)
     return importer.import_file(filepath, options)
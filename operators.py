@@ -8,6 +8,50 @@ from bpy.props import StringProperty, EnumProperty, FloatProperty, BoolProperty,
 from bpy_extras.io_utils import ImportHelper
 import os
 from . import importer
+from . import freecad_bridge
+
+
+# Set once FreeCAD auto-detection has run in this session
+_autodetect_done = False
+
+# Seconds between checks of a background conversion
+_POLL_INTERVAL = 0.1
+
+# Scale factor for each scale_preset identifier (CUSTOM uses custom_scale)
+_SCALE_MAP = {
+    '0.001': 0.001,
+    '0.01': 0.01,
+    '1.0': 1.0,
+    '0.0254': 0.0254,
+}
+
+
+def auto_detect_freecad(prefs):
+    """Run FreeCAD auto-detection on first use if no path is configured"""
+    global _autodetect_done
+    if _autodetect_done or prefs.freecad_path or not prefs.auto_detect_freecad:
+        return
+    _autodetect_done = True
+    print("ApexCad: Auto-detecting FreeCAD installation...")
+    bpy.ops.apexcad.detect_freecad()
+
+
+# Set once FreeCAD has been prewarmed in this session
+_prewarm_done = False
+
+
+def prewarm_freecad(context):
+    """
+    Validate FreeCAD in the background the first time an import is started
+    The file browser is still open, so FreeCAD's cold start overlaps the
+    user picking a file instead of delaying Blender's startup.
+    """
+    global _prewarm_done
+    prefs = context.preferences.addons[__package__].preferences
+    if _prewarm_done or not prefs.freecad_path:
+        return
+    _prewarm_done = True
+    freecad_bridge.prewarm(prefs.freecad_path)
 
 
 class APEXCAD_OT_ImportCAD(bpy.types.Operator, ImportHelper):
@@ -70,9 +114,20 @@ class APEXCAD_OT_ImportCAD(bpy.types.Operator, ImportHelper):
         max=5.0,
     )
     
+    extract_metadata: BoolProperty(
+        name="Extract Metadata",
+        description="Compute volume, surface area and bounding box for each part (slow on large assemblies)",
+        default=False,
+    )
+    
+    def invoke(self, context, event):
+        prewarm_freecad(context)
+        return ImportHelper.invoke(self, context, event)
+    
     def execute(self, context):
         # Get preferences
         prefs = context.preferences.addons[__package__].preferences
+        auto_detect_freecad(prefs)
         
         # Validate FreeCAD path first
         if not prefs.freecad_path:
@@ -95,25 +150,74 @@ class APEXCAD_OT_ImportCAD(bpy.types.Operator, ImportHelper):
         if self.scale_preset == 'CUSTOM':
             scale = self.custom_scale
         else:
-            scale = float(self.scale_preset)
+            scale = _SCALE_MAP[self.scale_preset]
         
         # Get chunk size from preferences
         chunk_size = prefs.max_chunk_size
         
-        # Show progress message
-        self.report({'INFO'}, f"Starting import... This may take a while.")
-        
-        # Import file
-        success, message, imported_objects = importer.import_cad_file(
-            context,
+        options = importer.make_options(
             self.filepath,
             scale=scale,
             hierarchy_mode=self.hierarchy_mode,
             y_up=self.y_up,
             chunk_size=chunk_size,
-            tessellation_quality=self.tessellation_quality
+            tessellation_quality=self.tessellation_quality,
+            extract_metadata=self.extract_metadata
         )
         
+        if prefs.use_async_import:
+            return self._start_async(context, options)
+        
+        # Show progress message
+        self.report({'INFO'}, f"Starting import... This may take a while.")
+        
+        # Import file
+        cad_importer = importer.CADImporter(context)
+        success, message, imported_objects = cad_importer.import_file(self.filepath, options)
+        return self._finish(context, success, message, imported_objects)
+    
+    def _start_async(self, context, options):
+        """Run the FreeCAD conversion in the background and poll it modally"""
+        self._importer = importer.CADImporter(context)
+        self._options = options
+        self._task, error = self._importer.start_import(self.filepath, options)
+        if error:
+            self.report({'ERROR'}, error)
+            return {'CANCELLED'}
+        
+        self.report({'INFO'}, "Converting in the background... (Esc to cancel)")
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(_POLL_INTERVAL, window=context.window)
+        wm.modal_handler_add(self)
+        wm.progress_begin(0, 100)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        if event.type == 'ESC' and not self._task.cancelled():
+            # The job stops at its next poll; the task is finished below once
+            # its thread no longer writes to the job directory
+            self._task.cancel()
+            self.report({'WARNING'}, "Cancelling import...")
+            return {'RUNNING_MODAL'}
+        
+        if event.type != 'TIMER' or not self._task.done():
+            if event.type == 'TIMER':
+                done, total = self._task.progress
+                context.window_manager.progress_update(int(done * 100 / max(total, 1)))
+            return {'PASS_THROUGH'}
+        
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        
+        success, message, imported_objects = self._importer.finish_import(self._task, self.filepath, self._options)
+        if not success and self._task.cancelled():
+            self.report({'INFO'}, "Import cancelled")
+            return {'CANCELLED'}
+        return self._finish(context, success, message, imported_objects)
+    
+    def _finish(self, context, success, message, imported_objects):
+        """Report the import result and select the new objects"""
         if success:
             self.report({'INFO'}, message)
             
@@ -156,6 +260,11 @@ class APEXCAD_OT_ImportCAD(bpy.types.Operator, ImportHelper):
         box.label(text="Mesh Quality:", icon='MOD_TRIANGULATE')
         box.prop(self, "tessellation_quality", slider=True)
         box.label(text="Lower values = Better quality (slower)", icon='INFO')
+        
+        # Metadata settings
+        box = layout.box()
+        box.label(text="Metadata:", icon='PROPERTIES')
+        box.prop(self, "extract_metadata")
 
 
 class APEXCAD_OT_Retessellate(bpy.types.Operator):
@@ -440,6 +549,7 @@ class APEXCAD_OT_BatchImport(bpy.types.Operator):
         
         # Validate FreeCAD first
         prefs = context.preferences.addons[__package__].preferences
+        auto_detect_freecad(prefs)
         
         if not prefs.freecad_path:
             self.report({'ERROR'}, "FreeCAD path not configured. Check addon preferences.")
@@ -463,7 +573,7 @@ class APEXCAD_OT_BatchImport(bpy.types.Operator):
         print(f"\nApexCad: Batch importing {len(cad_files)} files from {self.directory}")
         print("="*60)
         
-        scale = float(self.scale_preset)
+        scale = _SCALE_MAP[self.scale_preset]
         
         # Results tracking
         successful = []
@@ -539,6 +649,7 @@ class APEXCAD_OT_BatchImport(bpy.types.Operator):
             return {'CANCELLED'}
     
     def invoke(self, context, event):
+        prewarm_freecad(context)
         context.window_manager.fileselect_add(self)
         return {'RUNNING_MODAL'}
     
@@ -566,30 +677,19 @@ class APEXCAD_OT_TestFreeCAD(bpy.types.Operator):
             self.report({'ERROR'}, f"FreeCAD not found at: {prefs.freecad_path}")
             return {'CANCELLED'}
         
-        # Test version
-        try:
-            import subprocess
-            result = subprocess.run(
-                [prefs.freecad_path, "--version"],
-                capture_output=True,
-                text=True,
-                timeout=15
-            )
-            if result.returncode == 0:
-                version = result.stdout.strip()[:100]
-                self.report({'INFO'}, f"FreeCAD OK: {version}")
-                print(f"\nApexCad: FreeCAD test successful")
-                print(f"  Path: {prefs.freecad_path}")
-                print(f"  Version: {version}\n")
-                return {'FINISHED'}
-            else:
-                self.report({'ERROR'}, f"FreeCAD failed (code {result.returncode})")
-                return {'CANCELLED'}
-        except subprocess.TimeoutExpired:
-            self.report({'ERROR'}, "FreeCAD test timed out (>15s)")
-            return {'CANCELLED'}
-        except Exception as e:
-            self.report({'ERROR'}, f"Test failed: {str(e)}")
+        # Test version; an explicit test always runs FreeCAD again, and its
+        # result is cached for the next import
+        freecad_bridge.clear_validation_cache()
+        is_valid, message = freecad_bridge.validate_executable(prefs.freecad_path)
+        if is_valid:
+            version = message[:100]
+            self.report({'INFO'}, f"FreeCAD OK: {version}")
+            print(f"\nApexCad: FreeCAD test successful")
+            print(f"  Path: {prefs.freecad_path}")
+            print(f"  Version: {version}\n")
+            return {'FINISHED'}
+        else:
+            self.report({'ERROR'}, f"Test failed: {message}")
             return {'CANCELLED'}
 
 
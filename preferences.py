@@ -8,6 +8,12 @@ from bpy.types import AddonPreferences
 from bpy.props import StringProperty, BoolProperty, EnumProperty, IntProperty
 import os
 import subprocess
+from . import freecad_bridge
+
+
+def _freecad_path_changed(self, context):
+    """Re-validate FreeCAD after the path is edited"""
+    freecad_bridge.clear_validation_cache()
 
 
 class APEXCAD_AddonPreferences(AddonPreferences):
@@ -19,6 +25,7 @@ class APEXCAD_AddonPreferences(AddonPreferences):
         description="Path to FreeCAD executable (FreeCADCmd or freecad)",
         subtype='FILE_PATH',
         default="",
+        update=_freecad_path_changed,
     )
     
     # Auto-detect FreeCAD on startup
@@ -66,12 +73,26 @@ class APEXCAD_AddonPreferences(AddonPreferences):
         max=500,
     )
     
+    tessellation_workers: IntProperty(
+        name="Tessellation Workers",
+        description="Processes FreeCAD uses to tessellate parts in parallel (0 = all CPU cores, 1 = serial)",
+        default=1,
+        min=0,
+        max=64,
+    )
+    
     use_async_import: BoolProperty(
         name="Async Import",
         description="Use asynchronous import to prevent Blender freeze",
         default=True,
     )
     
+    verbose_console: BoolProperty(
+        name="Verbose Console Output",
+        description="Echo FreeCAD's live output to the system console (errors are always shown)",
+        default=False,
+    )
+    
     def draw(self, context):
         layout = self.layout
         
@@ -108,7 +129,9 @@ class APEXCAD_AddonPreferences(AddonPreferences):
         box = layout.box()
         box.label(text="Performance Settings:", icon='PREFERENCES')
         box.prop(self, "max_chunk_size")
+        box.prop(self, "tessellation_workers")
         box.prop(self, "use_async_import")
+        box.prop(self, "verbose_console")
 
 
 class APEXCAD_OT_DetectFreeCAD(bpy.types.Operator):
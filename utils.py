@@ -5,7 +5,10 @@ Coordinate conversion, naming, metadata handling
 
 import bpy
 import bmesh
+import hashlib
 import math
+import os
+import numpy as np
 from mathutils import Matrix, Vector, Quaternion, Euler
 
 
@@ -53,12 +56,15 @@ def z_up_to_y_up_matrix():
     return Matrix.Rotation(math.radians(-90), 4, 'X')
 
 
-def apply_y_up_conversion(obj):
-    """Apply Y-up conversion to object"""
-    if obj.type == 'MESH':
-        # Apply rotation to mesh data
-        obj.data.transform(z_up_to_y_up_matrix())
-        obj.data.update()
+def convert_vertices_y_up(vertices):
+    """
+    Convert an (N, 3) vertex array from Z-up to Y-up in place
+    Same rotation as z_up_to_y_up_matrix: (x, y, z) -> (x, z, -y)
+    """
+    y = vertices[:, 1].copy()
+    vertices[:, 1] = vertices[:, 2]
+    vertices[:, 2] = -y
+    return vertices
 
 
 def quaternion_to_euler(quat, order='XYZ'):
@@ -78,26 +84,38 @@ def set_custom_properties(obj, metadata):
     if not metadata:
         return
     
-    # Add custom properties
+    # Collect the supported values, then store them in one update
+    props = {}
     for key, value in metadata.items():
         if isinstance(value, (int, float, str, bool)):
-            try:
-                obj[f"cad_{key}"] = value
-            except:
-                pass
+            props[f"cad_{key}"] = value
         elif isinstance(value, dict):
             # Flatten nested dicts
             for sub_key, sub_value in value.items():
                 if isinstance(sub_value, (int, float, str, bool)):
-                    try:
-                        obj[f"cad_{key}_{sub_key}"] = sub_value
-                    except:
-                        pass
+                    props[f"cad_{key}_{sub_key}"] = sub_value
         elif isinstance(value, list) and len(value) <= 3:
             # Store as vector property
+            props[f"cad_{key}"] = value
+    
+    set_properties(obj, props)
+
+
+def set_properties(obj, props):
+    """
+    Store a dict of custom properties on an ID with a single update
+    Falls back to per-key assignment, skipping values Blender rejects
+    (e.g. ints beyond 32 bits), if the batch fails.
+    """
+    if not props:
+        return
+    try:
+        obj.id_properties_ensure().update(props)
+    except Exception:
+        for key, value in props.items():
             try:
-                obj[f"cad_{key}"] = value
-            except:
+                obj[key] = value
+            except Exception:
                 pass
 
 
@@ -159,75 +177,99 @@ def create_empty(name, location=(0, 0, 0), rotation=(0, 0, 0), parent=None, coll
     return empty
 
 
-def import_obj_file(filepath, obj_name, location=(0, 0, 0), rotation_quat=None, parent=None, collection=None, scale=1.0):
+def load_mesh_buffers(output_dir, buffers):
+    """
+    Load the consolidated mesh buffers written by the FreeCAD worker
+    
+    Args:
+        output_dir: Conversion output directory
+        buffers: Dict with 'vertices' and 'triangles' file names
+    
+    Returns:
+        (vertices, triangles) as (N, 3) float32 and (M, 3) uint32 arrays
+    """
+    vertices = np.fromfile(os.path.join(output_dir, buffers['vertices']), dtype=np.float32)
+    triangles = np.fromfile(os.path.join(output_dir, buffers['triangles']), dtype=np.uint32)
+    return vertices.reshape(-1, 3), triangles.reshape(-1, 3)
+
+
+def load_transform_buffer(output_dir, filename):
+    """
+    Load the per-object transforms side-car written by the FreeCAD worker
+    
+    Returns:
+        (N, 13) float32 array indexed by object slot: position xyz,
+        rotation quaternion xyzw, bbox min xyz, bbox max xyz (NaN if unknown)
+    """
+    transforms = np.fromfile(os.path.join(output_dir, filename), dtype=np.float32)
+    return transforms.reshape(-1, 13)
+
+
+def create_mesh_object(obj_name, vertices, triangles, location=(0, 0, 0), rotation_quat=None, parent=None, collection=None, scale=1.0):
     """
-    Import OBJ file directly by parsing and creating mesh
-    This avoids issues with Blender's OBJ importer merging objects
+    Create a mesh object directly from vertex/triangle arrays
+    Data is uploaded with foreach_set, no per-vertex Python work
     
     Args:
-        filepath: Path to OBJ file
-        obj_name: Name for imported object
+        obj_name: Name for the object and its mesh
+        vertices: (N, 3) float32 vertex coordinates
+        triangles: (M, 3) triangle vertex indices
         location: Object location
         rotation_quat: Rotation quaternion [w, x, y, z]
         parent: Parent object
         collection: Collection to link to
-        scale: Scale factor
+        scale: Scale factor applied to the vertices
     
     Returns:
-        Imported mesh object or None
+        Mesh object or None
     """
-    import os
-    
-    if not os.path.exists(filepath):
-        print(f"ApexCad: Warning - OBJ file not found: {filepath}")
+    if not len(vertices) or not len(triangles):
+        print(f"ApexCad: No geometry for {obj_name}")
         return None
     
-    # Parse OBJ file manually
-    vertices = []
-    faces = []
-    
     try:
-        with open(filepath, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                
-                parts = line.split()
-                if not parts:
-                    continue
-                
-                if parts[0] == 'v':  # Vertex
-                    # OBJ format: v x y z - apply scale during parsing
-                    vertices.append((
-                        float(parts[1]) * scale, 
-                        float(parts[2]) * scale, 
-                        float(parts[3]) * scale
-                    ))
-                
-                elif parts[0] == 'f':  # Face
-                    # OBJ format: f v1 v2 v3 or f v1/vt1/vn1 v2/vt2/vn2 v3/vt3/vn3
-                    # We only need vertex indices (convert to 0-based)
-                    face_verts = []
-                    for vert in parts[1:]:
-                        # Split by / and take first element (vertex index)
-                        vert_idx = int(vert.split('/')[0]) - 1  # OBJ is 1-based
-                        face_verts.append(vert_idx)
-                    faces.append(face_verts)
+        num_triangles = len(triangles)
         
-        if not vertices:
-            print(f"ApexCad: No vertices in OBJ file: {filepath}")
-            return None
+        if scale != 1.0:
+            vertices = vertices * scale
         
-        # Create mesh
         mesh = bpy.data.meshes.new(obj_name)
-        mesh.from_pydata(vertices, [], faces)
-        mesh.update()
+        mesh.vertices.add(len(vertices))
+        mesh.vertices.foreach_set("co", vertices.ravel())
+        mesh.loops.add(num_triangles * 3)
+        mesh.loops.foreach_set("vertex_index", triangles.astype(np.int32, copy=False).ravel())
+        mesh.polygons.add(num_triangles)
+        mesh.polygons.foreach_set("loop_start", np.arange(0, num_triangles * 3, 3, dtype=np.int32))
+        mesh.update(calc_edges=True)
         
         # Validate mesh
         mesh.validate()
         
-        # Create object
+        return create_object_from_mesh(obj_name, mesh, location, rotation_quat, parent, collection)
+        
+    except Exception as e:
+        print(f"ApexCad: Error creating mesh {obj_name}: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def create_object_from_mesh(obj_name, mesh, location=(0, 0, 0), rotation_quat=None, parent=None, collection=None):
+    """
+    Create an object using an existing mesh datablock (shared, not copied)
+    
+    Args:
+        obj_name: Name for the object
+        mesh: Mesh data block
+        location: Object location
+        rotation_quat: Rotation quaternion [w, x, y, z]
+        parent: Parent object
+        collection: Collection to link to
+    
+    Returns:
+        Mesh object or None
+    """
+    try:
         obj = bpy.data.objects.new(obj_name, mesh)
         
         # Apply transformations
@@ -251,7 +293,7 @@ def import_obj_file(filepath, obj_name, location=(0, 0, 0), rotation_quat=None,
         return obj
         
     except Exception as e:
-        print(f"ApexCad: Error parsing OBJ file {filepath}: {e}")
+        print(f"ApexCad: Error creating object {obj_name}: {e}")
         import traceback
         traceback.print_exc()
         return None
@@ -300,25 +342,32 @@ def select_objects(objects, active=None):
         bpy.context.view_layer.objects.active = objects[0]
 
 
-def apply_smooth_shading(obj, auto_smooth_angle=30):
+def apply_smooth_shading(objects, auto_smooth_angle=30):
     """
-    Apply auto smooth shading to CAD mesh for optimal surface display
+    Apply auto smooth shading to CAD meshes for optimal surface display
+    The operator runs once for all objects; selecting and deselecting per
+    object made large imports quadratic.
     
     Args:
-        obj: Blender mesh object
+        objects: Blender mesh object, or a list of them
         auto_smooth_angle: Auto smooth angle in degrees (default 30°)
     """
-    if obj.type != 'MESH':
+    if isinstance(objects, bpy.types.Object):
+        objects = [objects]
+    meshes = [obj for obj in objects if obj and obj.type == 'MESH']
+    if not meshes:
         return
     
     # Store selection state
-    was_selected = obj.select_get()
-    was_active = bpy.context.view_layer.objects.active
+    view_layer = bpy.context.view_layer
+    was_selected = [obj for obj in view_layer.objects if obj.select_get()]
+    was_active = view_layer.objects.active
     
-    # Select object
+    # Select objects
     bpy.ops.object.select_all(action='DESELECT')
-    obj.select_set(True)
-    bpy.context.view_layer.objects.active = obj
+    for obj in meshes:
+        obj.select_set(True)
+    view_layer.objects.active = meshes[0]
     
     # Apply shade auto smooth (Blender 4.1+)
     # This is better than shade_smooth for CAD surfaces
@@ -329,9 +378,10 @@ def apply_smooth_shading(obj, auto_smooth_angle=30):
         else:
             # Fallback: shade smooth + legacy auto smooth
             bpy.ops.object.shade_smooth()
-            if hasattr(obj.data, 'use_auto_smooth'):
-                obj.data.use_auto_smooth = True
-                obj.data.auto_smooth_angle = math.radians(auto_smooth_angle)
+            for obj in meshes:
+                if hasattr(obj.data, 'use_auto_smooth'):
+                    obj.data.use_auto_smooth = True
+                    obj.data.auto_smooth_angle = math.radians(auto_smooth_angle)
     except Exception as e:
         # Final fallback: just shade smooth
         try:
@@ -340,8 +390,11 @@ def apply_smooth_shading(obj, auto_smooth_angle=30):
             pass
     
     # Restore selection
-    obj.select_set(was_selected)
-    bpy.context.view_layer.objects.active = was_active
+    for obj in meshes:
+        obj.select_set(False)
+    for obj in was_selected:
+        obj.select_set(True)
+    view_layer.objects.active = was_active
 
 
 def create_material_from_color(name, color_rgba):
@@ -383,37 +436,47 @@ def create_material_from_color(name, color_rgba):
     return mat
 
 
-def mesh_hash(mesh_data):
+def geometry_hash(vertices, indices, precision=0.0001):
     """
-    Calculate hash of mesh geometry for instance detection
+    Calculate hash of raw mesh arrays for instance detection
+    
+    Coordinates are taken relative to the bounding box minimum, so copies
+    placed elsewhere hash alike, and snapped to a precision grid so float
+    noise doesn't split them.
     
     Args:
-        mesh_data: Blender mesh data
+        vertices: (N, 3) vertex coordinates
+        indices: Face vertex indices (triangles or loop vertex indices)
+        precision: Grid size coordinates are quantized to
     
     Returns:
         Hash string representing geometry
     """
-    # Use vertex count, face count, and volume as simple hash
-    vert_count = len(mesh_data.vertices)
-    face_count = len(mesh_data.polygons)
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    if len(vertices):
+        vertices = vertices - vertices.min(axis=0)
+    grid = np.round(vertices / precision).astype(np.int64)
+    indices = np.ascontiguousarray(indices, dtype=np.int32)
     
-    # Calculate approximate volume from bounding box
-    if vert_count > 0:
-        min_co = Vector(mesh_data.vertices[0].co)
-        max_co = Vector(mesh_data.vertices[0].co)
-        
-        for v in mesh_data.vertices:
-            for i in range(3):
-                min_co[i] = min(min_co[i], v.co[i])
-                max_co[i] = max(max_co[i], v.co[i])
-        
-        size = max_co - min_co
-        volume = size.x * size.y * size.z
-    else:
-        volume = 0
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.array([len(grid), indices.size], dtype=np.int64).tobytes())
+    digest.update(grid.tobytes())
+    digest.update(indices.tobytes())
+    return digest.hexdigest()
+
+
+def mesh_arrays(mesh_data):
+    """
+    Read a triangle mesh back as arrays
     
-    # Create hash from counts and volume
-    return f"{vert_count}_{face_count}_{volume:.6f}"
+    Returns:
+        ((N, 3) float32 vertex coordinates, (M, 3) int32 triangle indices)
+    """
+    co = np.empty(len(mesh_data.vertices) * 3, dtype=np.float32)
+    mesh_data.vertices.foreach_get("co", co)
+    loops = np.empty(len(mesh_data.loops), dtype=np.int32)
+    mesh_data.loops.foreach_get("vertex_index", loops)
+    return co.reshape(-1, 3), loops.reshape(-1, 3)
 
 
 def are_meshes_identical(mesh1, mesh2, tolerance=0.0001):